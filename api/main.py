@@ -1,10 +1,11 @@
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import shutil
 import os
+import asyncio
 import uuid
 import json
 import time
@@ -14,7 +15,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Core Modules
-from document_portal_core.ingestion import Ingestion
+from document_portal_core.ingestion import Ingestion, UnreadableImageError
 from document_portal_core.verifier import Verifier
 from document_portal_core.extractor import IDExtractor
 from document_portal_core.compliance import ComplianceChecker
@@ -27,7 +28,8 @@ from logger import GLOBAL_LOGGER as log
 
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="Document Portal API", version="1.0.0")
+# orjson encodes the (potentially large, multi-page) JSON responses in C
+app = FastAPI(title="Document Portal API", version="1.0.0", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -76,7 +78,7 @@ async def extract_id_endpoint(
         if user_id:
             cached_data = USER_STORE.get_user_data(user_id)
             if cached_data:
-                log.info(f"Cache hit for user {user_id}")
+                log.info("Cache hit for user", user_id=user_id)
                 return {"extracted": cached_data, "source": "cache"}
 
         # 2. Process Image (OCR)
@@ -99,6 +101,9 @@ async def extract_id_endpoint(
 
         return {"extracted": result, "source": "ocr"}
         
+    except UnreadableImageError as e:
+        # Tell the client to retake the photo rather than returning an empty extraction
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         log.error("ID Extraction failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -138,6 +143,8 @@ async def verify_contract(
         
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON in claims_json")
+    except UnreadableImageError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         log.error(f"Contract Verification failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -159,6 +166,8 @@ async def analyze_compliance(file: UploadFile = File(...)):
         result = compliance_checker.check_texas_lease_compliance(text)
         
         return result
+    except UnreadableImageError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         log.error(f"Compliance check failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -197,6 +206,58 @@ async def scan_document_endpoint(
             os.remove(output_path)
 
 # --- Phase 7 & 9: Invoice Extraction Endpoint ---
+# Pages of a batch are extracted concurrently (Gemini calls are network-bound);
+# the cap keeps a 50-file upload from bursting past the API rate limit
+MAX_CONCURRENT_INVOICE_PAGES = 8
+
+def _extract_invoice_page(temp_path: Path, filename: str, use_gemini: bool) -> Dict[str, Any]:
+    """
+    Runs compression + extraction for one uploaded page (blocking; called in a worker thread).
+    """
+    # Compression (Privacy/Speed optimization)
+    ingestion.compress_image(temp_path) 
+    
+    start_time = time.time()
+    if use_gemini:
+        result = gemini_extractor.extract_data(str(temp_path))
+        model_name = "gemini-2.0-flash"
+    else:
+        model_name = "tesseract_regex"
+        try:
+            text = ingestion._process_image(Path(temp_path))
+            result = invoice_extractor.extract_invoice_data(text)
+        except UnreadableImageError as e:
+            # Keep the rest of the batch; flag this page so it isn't mistaken for an empty invoice
+            result = {"data": {}, "confidence": 0, "error": str(e)}
+    duration = time.time() - start_time
+    
+    # Log
+    RESULT_MANAGER.log_result(
+        model_name=model_name, 
+        filename=filename, 
+        data=result.get("data", {}), 
+        duration_seconds=duration,
+        confidence=result.get("confidence", 0)
+    )
+    
+    # Pack result with filename for merging
+    return {
+        "filename": filename, 
+        "extracted": result,
+        "model_used": model_name
+    }
+
+async def _process_invoice_file(file: UploadFile, use_gemini: bool, limit: asyncio.Semaphore) -> Dict[str, Any]:
+    temp_path = UPLOAD_DIR / f"{uuid.uuid4()}_{file.filename}"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(await file.read())
+        async with limit:
+            return await asyncio.to_thread(_extract_invoice_page, temp_path, file.filename, use_gemini)
+    finally:
+        if temp_path.exists():
+            os.remove(temp_path)
+
 @app.post("/extract/invoice")
 async def extract_invoice_endpoint(
     files: List[UploadFile] = File(...),
@@ -206,48 +267,9 @@ async def extract_invoice_endpoint(
     Extracts data from Invoices/Bills. Supports Batch Upload (up to 50).
     Auto-merges split pages (e.g. Page 1 & Page 2 of same invoice).
     """
-    results = []
-    
-    # Process each file
-    for file in files:
-        temp_path = UPLOAD_DIR / f"{uuid.uuid4()}_{file.filename}"
-        try:
-            with open(temp_path, "wb") as f:
-                f.write(await file.read())
-                
-            # Compression (Privacy/Speed optimization)
-            ingestion.compress_image(temp_path) 
-            
-            start_time = time.time()
-            if use_gemini:
-                result = gemini_extractor.extract_data(str(temp_path))
-                model_name = "gemini-2.0-flash"
-            else:
-                text = ingestion._process_image(Path(temp_path))
-                result = invoice_extractor.extract_invoice_data(text)
-                model_name = "tesseract_regex"
-            duration = time.time() - start_time
-            
-            # Pack result with filename for merging
-            full_result = {
-                "filename": file.filename, 
-                "extracted": result,
-                "model_used": model_name
-            }
-            results.append(full_result)
-            
-            # Log
-            RESULT_MANAGER.log_result(
-                model_name=model_name, 
-                filename=file.filename, 
-                data=result.get("data", {}), 
-                duration_seconds=duration,
-                confidence=result.get("confidence", 0)
-            )
-            
-        finally:
-            if temp_path.exists():
-                os.remove(temp_path)
+    # Process each file (concurrently; gather keeps upload order for the merger)
+    limit = asyncio.Semaphore(MAX_CONCURRENT_INVOICE_PAGES)
+    results = list(await asyncio.gather(*(_process_invoice_file(file, use_gemini, limit) for file in files)))
 
     # Merge Results
     from document_portal_core.invoice_merger import InvoiceMerger
@@ -31,6 +31,12 @@ class ComplianceChecker:
         }
     ]
 
+    # must_contain normalized to a tuple of phrases once, not per call
+    _REQUIRED_PHRASES = tuple(
+        (req, (req["must_contain"],) if isinstance(req["must_contain"], str) else tuple(req["must_contain"]))
+        for req in TEXAS_LEASE_REQUIREMENTS
+    )
+
     def __init__(self):
         pass
 
@@ -42,25 +48,13 @@ class ComplianceChecker:
         results = []
         passed_count = 0
         
-        for req in self.TEXAS_LEASE_REQUIREMENTS:
-            check = {"id": req["id"], "description": req["description"], "status": "fail"}
-            
-            # Simple keyword matching first
-            required_phrases = req["must_contain"]
-            if isinstance(required_phrases, str):
-                required_phrases = [required_phrases]
-                
-            found = False
-            for phrase in required_phrases:
-                if phrase in text_lower:
-                    found = True
-                    break
-            
+        for req, required_phrases in self._REQUIRED_PHRASES:
+            # Simple keyword matching; str 'in' is a fast C scan, cheaper than one combined regex
+            found = any(phrase in text_lower for phrase in required_phrases)
             if found:
-                check["status"] = "pass"
                 passed_count += 1
             
-            results.append(check)
+            results.append({"id": req["id"], "description": req["description"], "status": "pass" if found else "fail"})
             
         score = (passed_count / len(self.TEXAS_LEASE_REQUIREMENTS)) * 100
         
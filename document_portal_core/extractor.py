@@ -3,10 +3,52 @@ ID Extraction module for Document Portal.
 Optimized for speed and low cost by using Regex patterns before falling back to LLM.
 """
 import re
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from datetime import datetime
 from logger import GLOBAL_LOGGER as log
 
+
+# Textual dates such as "January 15, 1990" or "Jan 15, 1990"
+_TEXTUAL_DATE_RE = re.compile(r"^([A-Za-z]+)\.?\s+(\d{1,2}),\s*(\d{4})$")
+_MONTH_NAMES = (
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+)
+_MONTHS = {name: idx for idx, name in enumerate(_MONTH_NAMES, start=1)}
+_MONTHS.update({name[:3]: idx for idx, name in enumerate(_MONTH_NAMES, start=1)})
+_MONTHS["sept"] = 9
+
+
+def _parse_textual_date(date_str: str) -> Optional[datetime]:
+    """Resolves 'Month DD, YYYY' via the month lookup table instead of strptime."""
+    match = _TEXTUAL_DATE_RE.match(date_str)
+    if not match:
+        return None
+    month = _MONTHS.get(match.group(1).lower())
+    if month is None:
+        return None
+    try:
+        return datetime(int(match.group(3)), month, int(match.group(2)))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(date_str: str) -> Optional[datetime]:
+    """Parses MM/DD/YYYY, MM-DD-YYYY, YYYY-MM-DD or 'Month DD, YYYY'. Pure, so cached."""
+    date_str = date_str.strip()
+    if date_str[:1].isalpha():
+        return _parse_textual_date(date_str)
+    normalized = date_str.replace('-', '/')
+    # Pick the layout from the shape ('-' already normalized to '/'): a 4-digit leading
+    # field means YYYY/MM/DD, otherwise MM/DD/YYYY, so strptime runs at most once
+    fmt = "%Y/%m/%d" if normalized.find('/') == 4 else "%m/%d/%Y"
+    try:
+        return datetime.strptime(normalized, fmt)
+    except ValueError:
+        return None
+
 class IDExtractor:
     """
     Extracts structured information from ID documents (Driver's Licenses, Passports).
@@ -22,6 +64,17 @@ class IDExtractor:
         "height": r"(HGT|HEIGHT)\s*[:.]?\s*(\d+['\-]\d+\"?)",
     }
 
+    _COMPILED = {key: re.compile(pattern) for key, pattern in PATTERNS.items()}
+
+    # (output field, pattern key) in extraction order; the value is the pattern's second group
+    _FIELDS = (
+        ("dob", "dob"),                      # 1. Dates (DOB, Expiration) - explicit labels
+        ("expiration_date", "exp"),
+        ("license_number", "dl_number"),     # 2. License Number
+        ("sex", "sex"),                      # 3. Sex
+        ("height", "height"),                # 4. Height
+    )
+
     def __init__(self):
         pass
 
@@ -32,34 +85,10 @@ class IDExtractor:
         extracted = {}
         text_upper = text.upper()
 
-        # 1. Dates (DOB, Expiration)
-        dates = re.findall(self.PATTERNS["date_match"], text_upper)
-        
-        # Heuristic: Expiration usually > DOB. 
-        # But explicitly looking for labels is safer.
-        
-        dob_match = re.search(self.PATTERNS["dob"], text_upper)
-        if dob_match:
-            extracted["dob"] = dob_match.group(2)
-        
-        exp_match = re.search(self.PATTERNS["exp"], text_upper)
-        if exp_match:
-            extracted["expiration_date"] = exp_match.group(2)
-
-        # 2. License Number
-        dl_match = re.search(self.PATTERNS["dl_number"], text_upper)
-        if dl_match:
-            extracted["license_number"] = dl_match.group(2)
-
-        # 3. Sex
-        sex_match = re.search(self.PATTERNS["sex"], text_upper)
-        if sex_match:
-            extracted["sex"] = sex_match.group(2)
-
-        # 4. Height
-        hgt_match = re.search(self.PATTERNS["height"], text_upper)
-        if hgt_match:
-            extracted["height"] = hgt_match.group(2)
+        for field, key in self._FIELDS:
+            match = self._COMPILED[key].search(text_upper)
+            if match:
+                extracted[field] = match.group(2)
             
         # 5. Name (Difficult with Regex alone, usually requires NER or LLM)
         # We will mark it as missing to trigger LLM fallback if needed.
@@ -76,12 +105,8 @@ class IDExtractor:
 
 
     def _parse_date(self, date_str: str) -> Optional[datetime]:
-        """Parses MM/DD/YYYY or MM-DD-YYYY"""
-        try:
-            date_str = date_str.replace('-', '/')
-            return datetime.strptime(date_str, "%m/%d/%Y")
-        except ValueError:
-            return None
+        """Parses MM/DD/YYYY, MM-DD-YYYY, YYYY-MM-DD or 'Month DD, YYYY'"""
+        return _parse_date(date_str)
 
     def validate_id_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -97,12 +122,13 @@ class IDExtractor:
         
         dob_str = data.get("dob")
         exp_str = data.get("expiration_date")
+        dob = self._parse_date(dob_str) if dob_str else None
+        exp = self._parse_date(exp_str) if exp_str else None
+        today = datetime.today()
         
         # 1. Age Calculation
         if dob_str:
-            dob = self._parse_date(dob_str)
             if dob:
-                today = datetime.today()
                 age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
                 validation_results["age"] = age
                 if age < 0:
@@ -117,9 +143,8 @@ class IDExtractor:
         
         # 2. Expiration Check
         if exp_str:
-            exp = self._parse_date(exp_str)
             if exp:
-                if exp < datetime.today():
+                if exp < today:
                     validation_results["valid"] = False
                     validation_results["is_expired"] = True
                     validation_results["errors"].append("ID is Expired.")
@@ -127,12 +152,9 @@ class IDExtractor:
                 validation_results["warnings"].append("Unparseable Expiration Date.")
         
         # 3. Logical Consistency
-        if dob_str and exp_str:
-            dob = self._parse_date(dob_str)
-            exp = self._parse_date(exp_str)
-            if dob and exp and exp < dob:
-                 validation_results["valid"] = False
-                 validation_results["errors"].append("Expiration Date is before Date of Birth.")
+        if dob and exp and exp < dob:
+            validation_results["valid"] = False
+            validation_results["errors"].append("Expiration Date is before Date of Birth.")
 
         return validation_results
 
@@ -4,18 +4,143 @@ This module provides the Ingestion class for robustly handling PDFs, Word files,
 It automatically corrects image orientation, de-skews, and extracts text using OCR.
 It is designed for speed and reliability, even with poorly taken photos.
 """
+import multiprocessing
+import os
 import sys
-from typing import Union
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, Optional, Union
 from pathlib import Path
 import cv2
 import numpy as np
 import pytesseract
-from pdf2image import convert_from_path
+import fitz  # PyMuPDF
 from docx import Document as DocxDocument
-from PIL import Image, ImageOps
+from docx.oxml.ns import qn
+from PIL import Image
 from logger import GLOBAL_LOGGER as log
 from exception.custom_exception import DocumentPortalException
 
+try:
+    from tesserocr import PyTessBaseAPI, PSM
+    _HAS_TESSEROCR = True
+except Exception:
+    _HAS_TESSEROCR = False
+
+# Upper bound on OCR worker processes for multi-page PDFs
+MAX_OCR_WORKERS = 8
+# Longest image side fed to Tesseract; larger scans are downscaled in memory before OCR
+MAX_OCR_DIMENSION = 1800
+# Below these, an image is treated as blank (grey-level std) or too blurred to OCR. Sharpness is
+# the Laplacian variance over Canny edge pixels only, so it doesn't drop with the amount of blank
+# page around the text: crisp print scores in the thousands, a 1-2px blur still well above this,
+# and only defocused frames (or ones with no edges at all) fall under it.
+MIN_CONTRAST_STD = 5.0
+MIN_SHARPNESS = 10.0
+
+
+class UnreadableImageError(ValueError):
+    """Raised when an image is too blank or blurred for OCR to return anything useful."""
+# Skew (degrees) below which de-skewing is skipped; not worth a full-image warp
+MIN_DESKEW_ANGLE = 0.5
+
+
+# Persistent Tesseract handle (created lazily, one per process); the API is not thread-safe
+_TESS_API = None
+_TESS_LOCK = threading.Lock()
+
+
+def _image_to_string(img) -> str:
+    """
+    OCRs an image file path, PIL image, or BGR/grayscale array.
+    Uses a reused tesserocr handle when installed, avoiding a tesseract subprocess and
+    model reload per call; falls back to pytesseract otherwise.
+    """
+    global _TESS_API
+    if not _HAS_TESSEROCR:
+        return pytesseract.image_to_string(img)
+    if isinstance(img, np.ndarray):
+        img = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB) if img.ndim == 3 else img)
+    with _TESS_LOCK:
+        if _TESS_API is None:
+            _TESS_API = PyTessBaseAPI(psm=PSM.AUTO)
+        if isinstance(img, str):
+            _TESS_API.SetImageFile(img)
+        else:
+            _TESS_API.SetImage(img)
+        return _TESS_API.GetUTF8Text()
+
+
+def _init_ocr_worker():
+    # One Tesseract thread per worker; parallelism comes from the process pool
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+# Shared OCR worker pool for multi-page PDFs (created lazily, reused across requests)
+_OCR_POOL = None
+_OCR_POOL_LOCK = threading.Lock()
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    """
+    Returns the shared OCR pool, starting it on first use.
+    Workers come from a forkserver (spawn where unavailable): forking the server process
+    directly would copy locks held by its background threads (logging, cache writers).
+    """
+    global _OCR_POOL
+    with _OCR_POOL_LOCK:
+        if _OCR_POOL is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _OCR_POOL = ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, MAX_OCR_WORKERS),
+                mp_context=multiprocessing.get_context(method),
+                initializer=_init_ocr_worker,
+            )
+        return _OCR_POOL
+
+
+def _reset_ocr_pool(pool: ProcessPoolExecutor) -> None:
+    # A worker died (e.g. OOM-killed); drop the broken pool so the next PDF starts a fresh one
+    global _OCR_POOL
+    with _OCR_POOL_LOCK:
+        if _OCR_POOL is pool:
+            _OCR_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _unreadable_reason(gray: np.ndarray) -> Optional[str]:
+    """Returns "blank" or "blurred" when a grayscale image isn't worth OCRing, else None."""
+    # meanStdDev reduces in one pass without float64 temporaries; CV_32F is exact for 8-bit input
+    if cv2.meanStdDev(gray)[1][0, 0] < MIN_CONTRAST_STD:
+        return "blank"
+    edges = cv2.Canny(gray, 50, 150)
+    if not cv2.countNonZero(edges):
+        return "blurred"
+    if cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_32F), mask=edges)[1][0, 0] ** 2 < MIN_SHARPNESS:
+        return "blurred"
+    return None
+
+
+def _ocr_page(page_path: str) -> str:
+    """
+    OCRs a single rendered page file and removes it afterwards.
+    Module-level so it can be shipped to pool workers; only the path is pickled.
+    """
+    try:
+        return _image_to_string(page_path)
+    except Exception as e:
+        log.warning("Tesseract OCR failed on PDF page; skipping page", error=str(e))
+        return ""
+    finally:
+        try:
+            os.remove(page_path)
+        except OSError:
+            pass
+
+
 class Ingestion:
     """
     Unified document ingestion for images, PDFs, and Word files.
@@ -38,6 +163,8 @@ class Ingestion:
         if suffix in {'.jpg', '.jpeg', '.png', '.bmp', '.tiff'}:
             try:
                 return self._process_image(file_path)
+            except UnreadableImageError:
+                raise
             except Exception as e:
                 log.error("Failed to ingest image", error=str(e))
                 raise DocumentPortalException("Document ingestion failed", sys)
@@ -66,10 +193,25 @@ class Ingestion:
             with Image.open(image_path) as img:
                 # Resize if too large
                 if max(img.size) > max_dimension:
-                    img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+                    # JPEGs: let libjpeg's DCT scaler decode straight to the smallest
+                    # power-of-two reduction that still covers the target (no-op for other formats)
+                    scale = max_dimension / max(img.size)
+                    target = (max(1, round(img.size[0] * scale)), max(1, round(img.size[1] * scale)))
+                    img.draft("RGB", target)
+                    # Bilinear is plenty for OCR/vision input and much cheaper than Lanczos
+                    img = img.resize(target, Image.Resampling.BILINEAR)
                 
-                # Convert to RGB if needed (handle PNG/RGBA)
-                if img.mode in ('RGBA', 'P'):
+                # Convert to RGB if needed (handle PNG/RGBA/CMYK...); RGB and L save as JPEG directly.
+                # Transparency is flattened onto white (a plain RGB convert turns it black),
+                # skipping the composite when the alpha channel is fully opaque
+                if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+                    if img.mode != 'RGBA':
+                        img = img.convert('RGBA')
+                    alpha_min, _ = img.getchannel('A').getextrema()
+                    if alpha_min < 255:
+                        img = Image.alpha_composite(Image.new('RGBA', img.size, (255, 255, 255, 255)), img)
+                    img = img.convert('RGB')
+                elif img.mode not in ('RGB', 'L'):
                     img = img.convert('RGB')
                     
                 # Save with compression
@@ -83,18 +225,30 @@ class Ingestion:
         """
         Processes an image using Tesseract OCR.
         Optimized for high-contrast docs.
+        Raises UnreadableImageError for blank or blurred images instead of OCRing them.
         """
         try:
-            # Compress first
-            self.compress_image(image_path)
-            
             img = cv2.imread(str(image_path))
             if img is None:
                 return ""
-                
+
+            # OCR time scales with pixel count; phone photos are far above Tesseract's useful DPI
+            h, w = img.shape[:2]
+            scale = min(1.0, MAX_OCR_DIMENSION / max(h, w))
+            if scale < 1.0:
+                img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+            # Blank or badly blurred shots only yield garbage; a cheap check saves a full OCR pass
+            reason = _unreadable_reason(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY))
+            if reason:
+                log.info("Skipping OCR on unreadable image", path=str(image_path), reason=reason)
+                raise UnreadableImageError(f"Image is too {reason} to read")
+
             # Basic OCR only
-            text = pytesseract.image_to_string(img)
+            text = _image_to_string(img)
             return text
+        except UnreadableImageError:
+            raise
         except Exception as e:
             log.error("Image processing failed", error=str(e))
             raise
@@ -102,7 +256,7 @@ class Ingestion:
     def _preprocess_for_ocr(self, img: np.ndarray) -> np.ndarray:
         """
         Applies binarization/thresholding to improve OCR accuracy.
-        Includes resizing and CLAHE for contrast fix.
+        Includes resizing and adaptive (Bradley) thresholding for uneven lighting.
         """
         try:
             # 1. Resize if huge (optimize speed) - already handled in scan_document but good here too
@@ -114,13 +268,12 @@ class Ingestion:
             # 2. Grayscale
             gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
             
-            # 3. CLAHE (Contrast Limited Adaptive Histogram Equalization) - "Out of Box" logic
-            # Great for receipts with bad lighting/shadows
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-            gray = clahe.apply(gray)
-
-            # 4. Otsu's Thresholding
-            _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            # 3. Bradley adaptive threshold: ink is anything darker than 85% of its local mean.
+            # Copes with receipt shadows/uneven lighting where one global Otsu cut fails, and
+            # the box-filter means are a single pass (integral-image style).
+            win = max(3, (gray.shape[1] // 8) | 1)
+            mean = cv2.boxFilter(gray, cv2.CV_32F, (win, win), borderType=cv2.BORDER_REPLICATE)
+            thresh = np.where(gray > mean * 0.85, 255, 0).astype(np.uint8)
             
             return thresh
         except Exception:
@@ -130,42 +283,79 @@ class Ingestion:
         # Use OpenCV and Tesseract to auto-rotate and de-skew
         try:
             gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            coords = np.column_stack(np.where(gray > 0))
+            # Fit the rectangle to edge pixels only; every non-black pixel is millions of points
+            # on a photo and just traces the frame
+            edges = cv2.Canny(gray, 50, 150)
+            ys, xs = np.nonzero(edges)
+            if xs.size == 0:
+                return img
+            coords = np.column_stack((xs, ys)).astype(np.float32)
             angle = cv2.minAreaRect(coords)[-1]
-            if angle < -45:
-                angle = -(90 + angle)
-            else:
-                angle = -angle
+            # minAreaRect reports [-90, 0) or (0, 90] depending on OpenCV version; fold to [-45, 45)
+            if angle >= 45:
+                angle -= 90
+            elif angle < -45:
+                angle += 90
+            if abs(angle) < MIN_DESKEW_ANGLE:
+                return img
             (h, w) = img.shape[:2]
             center = (w // 2, h // 2)
             M = cv2.getRotationMatrix2D(center, angle, 1.0)
-            rotated = cv2.warpAffine(img, M, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+            rotated = cv2.warpAffine(img, M, (w, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
             return rotated
         except Exception as e:
             log.warning("Auto-orientation failed, returning original image", error=str(e))
             return img
 
-    def _process_pdf(self, pdf_path: Path) -> str:
+    def _process_pdf(self, pdf_path: Path, dpi: int = 200) -> str:
         try:
-            images = convert_from_path(str(pdf_path))
-            text = ""
-            for img in images:
-                img = ImageOps.exif_transpose(img)
+            with fitz.open(str(pdf_path)) as doc, tempfile.TemporaryDirectory() as tmp_dir:
+                pages = self._iter_pdf_pages(doc, dpi, tmp_dir)
+                workers = min(os.cpu_count() or 1, MAX_OCR_WORKERS, doc.page_count)
+                if workers <= 1:
+                    return "".join(map(_ocr_page, pages))
+
+                # Tesseract is CPU-bound per page; OCR across cores while later pages render.
+                # At most two pages per worker are in flight, so memory stays flat on long PDFs.
+                parts = []
+                pending = deque()
+                executor = _get_ocr_pool()
                 try:
-                    text += pytesseract.image_to_string(img)
-                except Exception as e:
-                    log.warning("Tesseract OCR failed on PDF page; skipping page", error=str(e))
-                    continue
-            return text
+                    for page in pages:
+                        pending.append(executor.submit(_ocr_page, page))
+                        if len(pending) >= 2 * workers:
+                            parts.append(pending.popleft().result())
+                    parts.extend(future.result() for future in pending)
+                except BrokenProcessPool:
+                    _reset_ocr_pool(executor)
+                    raise
+                finally:
+                    # On error, let in-flight pages finish before their temp dir is removed
+                    for future in pending:
+                        future.cancel()
+                    wait(pending)
+                return "".join(parts)
         except Exception as e:
             log.error("PDF processing failed", error=str(e))
             raise
 
+    @staticmethod
+    def _iter_pdf_pages(doc, dpi: int, out_dir: str) -> Iterator[str]:
+        """
+        Renders pages one at a time to uncompressed grayscale PGM files and yields their paths.
+        Tesseract reads the files directly, so no per-page PNG encode happens in pytesseract.
+        """
+        for page in doc:
+            path = os.path.join(out_dir, f"page_{page.number:05d}.pgm")
+            page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY).save(path)
+            yield path
+
     def _process_docx(self, docx_path: Path) -> str:
         try:
             doc = DocxDocument(str(docx_path))
-            text = "\n".join([p.text for p in doc.paragraphs])
-            return text
+            # Read paragraph text straight off the body's w:p elements; doc.paragraphs would
+            # wrap each one in a Paragraph object first (same text, more allocation)
+            return "\n".join(p.text for p in doc.element.body.iterchildren(qn("w:p")))
         except Exception as e:
             log.error("DOCX processing failed", error=str(e))
             raise
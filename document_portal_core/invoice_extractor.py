@@ -8,6 +8,21 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 from logger import GLOBAL_LOGGER as log
 
+def _best_ranked_match(regex: re.Pattern, text: str) -> Optional[re.Match]:
+    """
+    Returns the match from the lowest-numbered rankN branch, earliest occurrence on ties.
+    Equivalent to searching each alternative separately in priority order, in a single pass.
+    """
+    best, best_rank = None, None
+    for match in regex.finditer(text):
+        rank = next(int(name[4:]) for name, val in match.groupdict().items()
+                    if val is not None and name.startswith("rank"))
+        if best_rank is None or rank < best_rank:
+            best, best_rank = match, rank
+            if rank == 0:
+                break
+    return best
+
 class InvoiceExtractor:
     """
     Extracts structured information from Invoices/Bills.
@@ -15,21 +30,17 @@ class InvoiceExtractor:
     
     PATTERNS = {
         # Money: Looks for $XX.XX or XX,XX
-        # Added: TOTAL SALES, INVOICE TOTAL
+        # Labels are alternatives tried in priority order (rank0 wins); one scan finds all of them.
+        # GRAND TOTAL needs no branch of its own: the TOTAL branch already covers it.
         "total_amount": [
-            r"TOTAL\s*SALES\s*[:.]?\s*[\$]?\s*([0-9,]+[.,][0-9]{2})",
-            r"INVOICE\s*TOTAL\s*[:.]?\s*[\$]?\s*([0-9,]+[.,][0-9]{2})",
-            r"AMOUNT\s*DUE\s*[:.]?\s*[\$]?\s*([0-9,]+[.,][0-9]{2})",
-            r"TOTAL\s*(AMOUNT|DUE)?\s*[:.]?\s*[\$]?\s*([0-9,]+[.,][0-9]{2})",
-            r"BALANCE\s*DUE\s*[:.]?\s*[\$]?\s*([0-9,]+[.,][0-9]{2})",
-            r"GRAND\s*TOTAL\s*[:.]?\s*[\$]?\s*([0-9,]+[.,][0-9]{2})",
-            # Fallback for just huge numbers at bottom? No, risky.
+            r"(?:(?P<rank0>TOTAL\s*SALES)|(?P<rank1>INVOICE\s*TOTAL)|(?P<rank2>AMOUNT\s*DUE)"
+            r"|(?P<rank3>TOTAL(?:\s*(?:AMOUNT|DUE))?)|(?P<rank4>BALANCE\s*DUE))"
+            r"\s*[:.]?\s*[\$]?\s*(?P<value>[0-9,]+[.,][0-9]{2})",
         ],
         # Date: MM/DD/YYYY or YYYY-MM-DD
         "date": [
-            r"(INVOICE|BILL|DUE)\s*DATE\s*[:.]?\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})",
-            r"DATE\s*[:.]?\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})",
-            r"(\d{4}[-]\d{2}[-]\d{2})" # YYYY-MM-DD standalone
+            r"(?:(?P<rank0>(?:INVOICE|BILL|DUE)\s*DATE)|(?P<rank1>DATE))\s*[:.]?\s*(?P<value>\d{1,2}[/-]\d{1,2}[/-]\d{2,4})"
+            r"|(?P<rank2>\d{4}[-]\d{2}[-]\d{2})" # YYYY-MM-DD standalone
         ],
         # Invoice Number: #12345 or Inv: 12345
         "invoice_number": [
@@ -41,56 +52,57 @@ class InvoiceExtractor:
         "type_lottery": [r"MEGA", r"LOTO", r"SCRATCH", r"JACKPOT"]
     }
 
+    # Compiled once at import; IGNORECASE so callers need not upper-case the text first
+    _COMPILED = {key: [re.compile(p, re.IGNORECASE) for p in patterns] for key, patterns in PATTERNS.items()}
+
+    # Classification keywords folded into one alternation per type (single scan each)
+    _TYPE_KEYWORDS = (
+        ("shift_report", re.compile("|".join(PATTERNS["type_shift_report"]), re.IGNORECASE)),
+        ("lottery_report", re.compile("|".join(PATTERNS["type_lottery"]), re.IGNORECASE)),
+    )
+
+    # Fields that count towards confidence (each worth 33 points)
+    _SCORED_FIELDS = ("total_amount", "invoice_date", "invoice_number")
+
     def extract_invoice_data(self, text: str) -> Dict[str, Any]:
         """
         Extracts invoice data from raw text.
         """
         # Debug: Print first 500 chars to log to see what Tesseract is seeing
-        log.info(f"Raw Text Preview: {text[:500]}")
+        log.debug("Raw Text Preview", text=text[:500])
         
-        text_upper = text.upper()
         extracted = {}
         
         # 0. Classify Document Type
         doc_type = "invoice"
-        for keyword in self.PATTERNS["type_shift_report"]:
-            if re.search(keyword, text_upper):
-                doc_type = "shift_report"
+        for type_name, keywords in self._TYPE_KEYWORDS: # shift takes precedence over lottery
+            if keywords.search(text):
+                doc_type = type_name
                 break
-        if doc_type == "invoice": # check lottery if not shift
-             for keyword in self.PATTERNS["type_lottery"]:
-                if re.search(keyword, text_upper):
-                    doc_type = "lottery_report"
-                    break
         extracted["detected_type"] = doc_type
 
         # 1. Total Amount (Highest Priority)
-        for pattern in self.PATTERNS["total_amount"]:
-            match = re.search(pattern, text_upper)
-            if match:
-                # Get the last group matches which should be the amount
-                amount_str = match.groups()[-1]
-                # Normalize comma to dot
-                amount_str = amount_str.replace(",", ".") 
-                # Fix double dots if any (e.g. 792.04. -> 792.04)
-                if amount_str.count(".") > 1:
-                     amount_str = amount_str.replace(".", "", amount_str.count(".") - 1)
-                     
-                extracted["total_amount"] = amount_str
-                break
+        match = _best_ranked_match(self._COMPILED["total_amount"][0], text)
+        if match:
+            amount_str = match["value"]
+            # Normalize comma to dot
+            amount_str = amount_str.replace(",", ".") 
+            # Fix double dots if any (e.g. 792.04. -> 792.04)
+            if amount_str.count(".") > 1:
+                 amount_str = amount_str.replace(".", "", amount_str.count(".") - 1)
+                 
+            extracted["total_amount"] = amount_str
         
-        # 2. Date
-        for pattern in self.PATTERNS["date"]:
-            match = re.search(pattern, text_upper)
-            if match:
-                extracted["invoice_date"] = match.groups()[-1]
-                break
+        # 2. Date (the standalone ISO branch has no separate value group)
+        match = _best_ranked_match(self._COMPILED["date"][0], text)
+        if match:
+            extracted["invoice_date"] = match[match.lastgroup]
                 
         # 3. Invoice Number
-        for pattern in self.PATTERNS["invoice_number"]:
-            match = re.search(pattern, text_upper)
+        for pattern in self._COMPILED["invoice_number"]:
+            match = pattern.search(text)
             if match:
-                val = match.groups()[-1]
+                val = match.groups()[-1].upper()
                 if any(char.isdigit() for char in val):
                     extracted["invoice_number"] = val
                     break
@@ -101,7 +113,7 @@ class InvoiceExtractor:
             extracted["vendor_name_guess"] = lines[0]
 
         # Calculate Confidence
-        fields_found = len([k for k in extracted.keys() if k not in ["vendor_name_guess", "detected_type"]])
+        fields_found = sum(1 for field in self._SCORED_FIELDS if field in extracted)
         confidence = min(fields_found * 33, 100)
         
         # Boost confidence if we found Total Amount (most important)
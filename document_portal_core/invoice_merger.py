@@ -1,7 +1,44 @@
 
+from collections import defaultdict, namedtuple
+from itertools import chain
 from typing import List, Dict, Any
 from logger import GLOBAL_LOGGER as log
 
+# Shared read-only stand-in for missing sub-dicts (never mutated)
+_EMPTY: Dict[str, Any] = {}
+
+# Flat view of the fields the merge passes need; `src` is the original result dict
+Projection = namedtuple("Projection", "has_data inv_num total total_key vendor date doc_type has_shift src")
+
+
+def _total_key(total: Any) -> Any:
+    """Normalizes a total to a 2-dp float so 55.55, 55.550 and "55.55" index together."""
+    try:
+        return round(float(total), 2)
+    except (TypeError, ValueError):
+        return total
+
+
+def _project(res: Dict[str, Any]) -> Projection:
+    data = (res.get("extracted") or _EMPTY).get("data")
+    has_data = bool(data)
+    data = data or _EMPTY
+    details = data.get("invoice_details") or _EMPTY
+    shift_details = data.get("shift_report_details") or _EMPTY
+    total = (data.get("financials") or _EMPTY).get("total_amount")
+    return Projection(
+        has_data=has_data,
+        inv_num=details.get("number"),
+        total=total,
+        total_key=_total_key(total) if total is not None else None,
+        vendor=(data.get("vendor") or _EMPTY).get("name"),
+        date=details.get("date"),
+        doc_type=(data.get("doc_type") or "").lower(),
+        has_shift=any(v is not None for v in shift_details.values()),
+        src=res,
+    )
+
+
 class InvoiceMerger:
     """
     Intelligently merges split invoice pages into a single document record.
@@ -23,153 +60,107 @@ class InvoiceMerger:
         # 2. Hold "orphans" (no invoice number).
         # 3. Try to attach orphans to groups based on Total Amount.
         
-        invoice_groups = {} # Key: InvoiceNum, Value: list of results
+        # Project every result once into a flat record so the passes below work on
+        # attribute loads instead of re-walking the nested extraction dicts.
+        projections = [_project(res) for res in results]
+
+        invoice_groups = defaultdict(list) # Key: InvoiceNum, Value: list of projections
         orphans = []
         
         # Pass 1: Group by strong signal (Invoice Details)
-        for res in results:
-            data = res.get("extracted", {}).get("data", {})
-            if not data:
+        for proj in projections:
+            if not proj.has_data:
                 continue # Skip empty
                 
-            inv_num = data.get("invoice_details", {}).get("number")
-            
-            if inv_num:
-                key = str(inv_num).strip()
-                if key not in invoice_groups:
-                    invoice_groups[key] = []
-                invoice_groups[key].append(res)
+            if proj.inv_num:
+                invoice_groups[str(proj.inv_num).strip()].append(proj)
             else:
-                orphans.append(res)
+                orphans.append(proj)
                 
         # Pass 2: Attach Orphans by Total Amount
-        orphan_groups = {} # Key: TotalAmount, Value: list of results
+        # First invoice group per master total, so each orphan is an O(1) lookup
+        group_by_total = {}
+        for inv_key, group in invoice_groups.items():
+            if group[0].total_key is not None:
+                group_by_total.setdefault(group[0].total_key, inv_key)
+
+        orphan_groups = defaultdict(list) # Key: TotalAmount, Value: list of projections
         
-        for orphan in orphans:
-            data = orphan.get("extracted", {}).get("data", {})
-            total = data.get("financials", {}).get("total_amount")
-            
-            matched = False
-            
-            # Try to match with existing invoice group
-            if total is not None:
-                for inv_key, group in invoice_groups.items():
-                    master_total = group[0].get("extracted", {}).get("data", {}).get("financials", {}).get("total_amount")
-                    if master_total == total:
-                        invoice_groups[inv_key].append(orphan)
-                        matched = True
-                        break
-            
-            if not matched:
-                key = float(total) if total is not None else "unknown"
-                if key not in orphan_groups:
-                    orphan_groups[key] = []
-                orphan_groups[key].append(orphan)
+        for proj in orphans:
+            inv_key = group_by_total.get(proj.total_key) if proj.total_key is not None else None
+            if inv_key is not None:
+                invoice_groups[inv_key].append(proj)
+            else:
+                orphan_groups[float(proj.total) if proj.total is not None else "unknown"].append(proj)
                 
         # Pass 3: Attach Shift Reports by Date + Vendor
-        shift_groups = {} # Key: (Date, VendorName), Value: list
+        shift_groups = defaultdict(list) # Key: (Date, VendorName), Value: list of projections
         final_orphans = []
         
-        for orphan in orphan_groups.values():
-            for item in orphan:
-                data = item.get("extracted", {}).get("data", {})
-                doc_type = data.get("doc_type", "").lower() if data.get("doc_type") else ""
-                
-                shift_details = data.get("shift_report_details", {})
-                has_shift_data = any(v is not None for v in shift_details.values())
-                
-                if "shift" in doc_type or "audit" in doc_type or "report" in doc_type or has_shift_data:
-                    vendor_name = data.get("vendor", {}).get("name")
-                    inv_date = data.get("invoice_details", {}).get("date")
-                    
-                    if vendor_name and inv_date:
-                        key = (inv_date, vendor_name)
-                        if key not in shift_groups:
-                            shift_groups[key] = []
-                        shift_groups[key].append(item)
+        for group in orphan_groups.values():
+            for proj in group:
+                doc_type = proj.doc_type
+                if "shift" in doc_type or "audit" in doc_type or "report" in doc_type or proj.has_shift:
+                    if proj.vendor and proj.date:
+                        shift_groups[(proj.date, proj.vendor)].append(proj)
                     else:
-                        final_orphans.append(item)
+                        final_orphans.append(proj)
                 else:
-                    final_orphans.append(item)
+                    final_orphans.append(proj)
 
         # Pass 4: Attach Headerless Shift Pages
         # Scenario A: Exactly one Strong Shift Group
         if len(shift_groups) == 1:
-            key = list(shift_groups.keys())[0]
-            remaining_orphans = []
-            for item in final_orphans:
-                 data = item.get("extracted", {}).get("data", {})
-                 shift_details = data.get("shift_report_details", {})
-                 has_shift_data = any(v is not None for v in shift_details.values())
-                 
-                 if has_shift_data:
-                     shift_groups[key].append(item)
-                 else:
-                     remaining_orphans.append(item)
-            final_orphans = remaining_orphans
+            key = next(iter(shift_groups))
+            shift_groups[key].extend(proj for proj in final_orphans if proj.has_shift)
+            final_orphans = [proj for proj in final_orphans if not proj.has_shift]
             
         # Scenario B: No Strong Group, multiple weak pages
         elif len(shift_groups) == 0:
-            potential_shift_pages = []
-            remaining_orphans = []
-            
-            for item in final_orphans:
-                 data = item.get("extracted", {}).get("data", {})
-                 shift_details = data.get("shift_report_details", {})
-                 has_shift_data = any(v is not None for v in shift_details.values())
-                 
-                 if has_shift_data:
-                     potential_shift_pages.append(item)
-                 else:
-                     remaining_orphans.append(item)
+            potential_shift_pages = [proj for proj in final_orphans if proj.has_shift]
             
             if len(potential_shift_pages) > 1:
                 synth_key = ("Unknown Date", "Shift Report")
                 shift_groups[synth_key] = potential_shift_pages
-                final_orphans = remaining_orphans
+                final_orphans = [proj for proj in final_orphans if not proj.has_shift]
 
         # Collect results
-        for group in invoice_groups.values():
+        for group in chain(invoice_groups.values(), shift_groups.values()):
             if len(group) > 1:
-                merged_docs.append(self._merge_group(group))
+                merged_docs.append(self._merge_group([proj.src for proj in group]))
             else:
-                merged_docs.append(group[0])
-                
-        for group in shift_groups.values():
-             if len(group) > 1:
-                merged_docs.append(self._merge_group(group))
-             else:
-                merged_docs.append(group[0])
+                merged_docs.append(group[0].src)
 
-        merged_docs.extend(final_orphans)
+        merged_docs.extend(proj.src for proj in final_orphans)
         return merged_docs
 
     def _merge_group(self, group: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Combines a list of partial invoice results into one master result.
         """
-        master = group[0].copy()
+        # Copy only the containers mutated below (top level, extracted, data, shift
+        # details) so input pages are untouched; the rest is shared, not deep-copied
+        master = dict(group[0])
+        master_data = {}
+        if "extracted" in master:
+            master["extracted"] = dict(master["extracted"])
+            if "data" in master["extracted"]:
+                master_data = master["extracted"]["data"] = dict(master["extracted"]["data"])
+        if isinstance(master_data.get("shift_report_details"), dict):
+            master_data["shift_report_details"] = dict(master_data["shift_report_details"])
         
-        # Deep copy data structure to avoid mutation issues
-        import copy
-        master = copy.deepcopy(group[0])
-        master_data = master.get("extracted", {}).get("data", {})
-        
-        all_line_items = []
+        datas = [item.get("extracted", {}).get("data", {}) for item in group]
+
+        # 1. Combine Line Items
+        all_line_items = list(chain.from_iterable(data.get("line_items") or [] for data in datas))
         
-        for item in group:
-            data = item.get("extracted", {}).get("data", {})
-            
-            # 1. Combine Line Items
-            lines = data.get("line_items", [])
-            if lines:
-                all_line_items.extend(lines)
-                
-            # 2. Fill Missing Vendor Info
-            if not master_data.get("vendor", {}).get("phone") and data.get("vendor", {}).get("phone"):
-                 if "vendor" not in master_data: master_data["vendor"] = {}
-                 master_data["vendor"]["phone"] = data.get("vendor").get("phone")
-            
+        # 2. Fill Missing Vendor Info (first page that has a phone wins)
+        if not (master_data.get("vendor") or _EMPTY).get("phone"):
+            phone = next((p for p in ((data.get("vendor") or _EMPTY).get("phone") for data in datas) if p), None)
+            if phone:
+                master_data["vendor"] = {**(master_data.get("vendor") or {}), "phone": phone}
+
+        for data in datas:
             # 3. Combine Shift Report Details (Fill Blanks)
             if "shift_report_details" in data:
                 if "shift_report_details" not in master_data:
@@ -183,8 +174,6 @@ class InvoiceMerger:
                         master_details[k] = v
                  
         # Update Master
-        if "line_items" not in master_data:
-             master_data["line_items"] = []
         master_data["line_items"] = all_line_items
         
         # Flag as Merged
@@ -11,7 +11,6 @@ from operator import itemgetter
 from langchain_core.messages import BaseMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_community.vectorstores import FAISS
 from utils.model_loader import ModelLoader
 from exception.custom_exception import DocumentPortalException
 from logger import GLOBAL_LOGGER as log
@@ -26,7 +25,7 @@ class ConversationalRAG:
     def __init__(self, session_id: Optional[str], retriever=None):
         try:
             self.session_id = session_id
-            self.llm = self._load_llm()
+            self._llm = None # loaded on first use, see the llm property
             self.contextualize_prompt: ChatPromptTemplate = PROMPT_REGISTRY[
                 PromptType.CONTEXTUALIZE_QUESTION.value
             ]
@@ -56,6 +55,8 @@ class ConversationalRAG:
         try:
             if not os.path.isdir(index_path):
                 raise FileNotFoundError(f"FAISS index directory not found: {index_path}")
+            # Imported here so constructing a RAG (tests, API warmup) doesn't pull in FAISS
+            from langchain_community.vectorstores import FAISS
             embeddings = ModelLoader().load_embeddings()
             vectorstore = FAISS.load_local(
                 index_path,
@@ -107,6 +108,13 @@ class ConversationalRAG:
             log.error("Failed to invoke ConversationalRAG", error=str(e))
             raise DocumentPortalException("Invocation error in ConversationalRAG", sys)
 
+    @property
+    def llm(self):
+        """LLM client, loaded on first use (when the LCEL chain is built)."""
+        if self._llm is None:
+            self._llm = self._load_llm()
+        return self._llm
+
     def _load_llm(self):
         try:
             llm = ModelLoader().load_llm()
@@ -5,30 +5,56 @@ Logs extraction results, performance metrics, and usage costs to a structured di
 import os
 import json
 import time
+import atexit
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except Exception:
+    _HAS_ORJSON = False
 
 class ResultManager:
-    def __init__(self, base_dir: str = "results"):
+    def __init__(self, base_dir: str = "results", indent: Optional[int] = 2):
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(exist_ok=True)
+        # JSON indent for result files; None writes compact JSON (smaller, faster)
+        self.indent = indent
+        self._ensured_dirs = set()
+        self._dirs_lock = threading.Lock()
+
+        # Results are serialized and written by a single background thread so callers
+        # never wait on JSON encoding or disk I/O
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="result-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
 
     def log_result(self, model_name: str, filename: str, data: dict, duration_seconds: float, confidence: float):
         """
-        Saves the result to results/{model_name}/{timestamp}_{filename}.json
+        Queues the result to be saved to results/{model_name}/{timestamp}_{filename}.json.
+        Call flush() to wait for pending writes.
         """
-        # Create model directory
+        # Create model directory (once per model)
         model_dir = self.base_dir / model_name
-        model_dir.mkdir(exist_ok=True)
+        if model_name not in self._ensured_dirs:
+            with self._dirs_lock:
+                model_dir.mkdir(parents=True, exist_ok=True)
+                self._ensured_dirs.add(model_name)
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         safe_filename = Path(filename).stem
         output_file = model_dir / f"{timestamp}_{safe_filename}.json"
         
         record = {
             "metadata": {
                 "filename": filename,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "model": model_name,
                 "duration_seconds": round(duration_seconds, 4),
                 "confidence_score": confidence
@@ -36,10 +62,31 @@ class ResultManager:
             "extraction": data
         }
         
-        try:
-            with open(output_file, 'w') as f:
-                json.dump(record, f, indent=2)
-        except Exception as e:
-            print(f"Failed to log result: {e}")
+        self._queue.put((output_file, record))
+
+    def flush(self):
+        """
+        Blocks until every queued result has been written.
+        """
+        self._queue.join()
+
+    def _dumps(self, record: dict) -> bytes:
+        # orjson only supports 2-space or no indentation; anything else goes through stdlib json
+        if _HAS_ORJSON and self.indent in (None, 2):
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if self.indent == 2:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(record, option=option)
+        return json.dumps(record, indent=self.indent).encode("utf-8")
+
+    def _write_loop(self):
+        while True:
+            output_file, record = self._queue.get()
+            try:
+                output_file.write_bytes(self._dumps(record))
+            except Exception as e:
+                print(f"Failed to log result: {e}")
+            finally:
+                self._queue.task_done()
 
 RESULT_MANAGER = ResultManager()
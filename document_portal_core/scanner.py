@@ -12,6 +12,16 @@ from logger import GLOBAL_LOGGER as log
 from pathlib import Path
 
 class DocumentScanner:
+    # Minimum fraction of edge pixels before searching for a document outline. A clean page
+    # on a plain background is just its 1px outline: ~0.0015 of the proxy for the smallest
+    # page MIN_DOC_AREA_FRACTION accepts, under 0.01 even for a full-frame page. Keep this
+    # well below that floor so only blank/washed-out frames are rejected.
+    MIN_EDGE_DENSITY = 0.0005
+    # Smallest contour area, as a fraction of the frame, considered as the document outline
+    MIN_DOC_AREA_FRACTION = 0.1
+    # Height of the proxy image used for edge/contour detection
+    DETECTION_HEIGHT = 500
+
     def scan_document(self, image_path: str, output_path: str = None) -> str:
         """
         Processes an image to extract the document page.
@@ -35,31 +45,24 @@ class DocumentScanner:
                 # For "Contract App", 1500px height is plenty sufficient for OCR.
                 img = cv2.resize(img, (int(w*ratio), 1500))
 
-            # 2. Preprocessing (Gray -> Blur -> Canny)
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            # 2. Preprocessing (Gray -> Blur -> Canny) on a small proxy; the outline
+            # doesn't need full resolution, and the corners are mapped back for the warp
+            h, w = img.shape[:2]
+            proxy_ratio = min(1.0, self.DETECTION_HEIGHT / h)
+            proxy = img if proxy_ratio == 1.0 else cv2.resize(
+                img, (int(w * proxy_ratio), self.DETECTION_HEIGHT), interpolation=cv2.INTER_AREA)
+            gray = cv2.cvtColor(proxy, cv2.COLOR_BGR2GRAY)
             blur = cv2.GaussianBlur(gray, (5, 5), 0)
             edges = cv2.Canny(blur, 75, 200)
 
             # 3. Find Contours
-            cnts, _ = cv2.findContours(edges.copy(), cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
-            # Sort by area, largest first
-            cnts = sorted(cnts, key=cv2.contourArea, reverse=True)[:5]
-
-            doc_cnt = None
-            for c in cnts:
-                # Approximate the contour
-                peri = cv2.arcLength(c, True)
-                approx = cv2.approxPolyDP(c, 0.02 * peri, True)
-
-                # If has 4 points, we assume it's our document
-                if len(approx) == 4:
-                    doc_cnt = approx
-                    break
+            doc_cnt = self._find_document_contour(edges)
 
             # 4. Perspective Transform
             if doc_cnt is not None:
                 log.info("Document contour found, warping perspective.")
-                warped = self._four_point_transform(img, doc_cnt.reshape(4, 2))
+                corners = doc_cnt.reshape(4, 2).astype("float32") / proxy_ratio
+                warped = self._four_point_transform(img, corners)
             else:
                 log.warning("No document contour found. Returning original image.")
                 warped = img
@@ -83,18 +86,40 @@ class DocumentScanner:
             log.error(f"Scan failed: {e}")
             return image_path # Fallback
 
+    def _find_document_contour(self, edges):
+        """Returns the largest 4-point contour in the edge map, or None."""
+        # Blank or washed-out frames cannot hold a document outline; skip the contour pass
+        if cv2.countNonZero(edges) < self.MIN_EDGE_DENSITY * edges.size:
+            return None
+
+        # RETR_LIST, not RETR_EXTERNAL: the page is often nested inside a larger outline
+        # (table, clipboard, placemat) that isn't a quad itself
+        cnts, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+        # Sort by area, largest first (areas computed once)
+        areas_cnts = sorted(((cv2.contourArea(c), c) for c in cnts), key=lambda ac: ac[0], reverse=True)[:5]
+        min_area = self.MIN_DOC_AREA_FRACTION * edges.size
+
+        for area, c in areas_cnts:
+            # Everything after this is smaller still; too small to be the page
+            if area < min_area:
+                break
+            # Approximate the contour
+            peri = cv2.arcLength(c, True)
+            approx = cv2.approxPolyDP(c, 0.02 * peri, True)
+
+            # If has 4 points, we assume it's our document
+            if len(approx) == 4:
+                return approx
+        return None
+
     def _four_point_transform(self, image, pts):
         # 1. Order points (tl, tr, br, bl)
         rect = self._order_points(pts)
-        (tl, tr, br, bl) = rect
 
         # 2. Compute width/height of new image
-        widthA = np.sqrt(((br[0] - bl[0]) ** 2) + ((br[1] - bl[1]) ** 2))
-        widthB = np.sqrt(((tr[0] - tl[0]) ** 2) + ((tr[1] - tl[1]) ** 2))
+        # Edge lengths in one call: bottom (br-bl), top (tr-tl), right (tr-br), left (tl-bl)
+        widthA, widthB, heightA, heightB = np.linalg.norm(rect[[2, 1, 1, 0]] - rect[[3, 0, 2, 3]], axis=1)
         maxWidth = max(int(widthA), int(widthB))
-
-        heightA = np.sqrt(((tr[0] - br[0]) ** 2) + ((tr[1] - br[1]) ** 2))
-        heightB = np.sqrt(((tl[0] - bl[0]) ** 2) + ((tl[1] - bl[1]) ** 2))
         maxHeight = max(int(heightA), int(heightB))
 
         # 3. Construct destination points
@@ -110,17 +135,8 @@ class DocumentScanner:
         return warped
 
     def _order_points(self, pts):
-        # Initialzie a list of coordinates: top-left, top-right, bottom-right, bottom-left
-        rect = np.zeros((4, 2), dtype="float32")
-
-        # Top-left has smallest sum, Bottom-right has largest sum
-        s = pts.sum(axis=1)
-        rect[0] = pts[np.argmin(s)]
-        rect[2] = pts[np.argmax(s)]
-
-        # Top-right has smallest diff, Bottom-left has largest diff
-        diff = np.diff(pts, axis=1)
-        rect[1] = pts[np.argmin(diff)]
-        rect[3] = pts[np.argmax(diff)]
-
-        return rect
+        # Order as top-left, top-right, bottom-right, bottom-left
+        # Top-left has smallest x+y, bottom-right largest; top-right has largest x-y, bottom-left smallest
+        s = pts[:, 0] + pts[:, 1]
+        d = pts[:, 0] - pts[:, 1]
+        return pts[[s.argmin(), d.argmax(), s.argmax(), d.argmin()]].astype("float32", copy=False)
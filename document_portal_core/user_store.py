@@ -1,52 +1,164 @@
 """
 User Data Persistence Module.
 Caches extracted ID information to avoid re-running OCR for known users.
-Uses a JSON file for storage (simple and effective for MVP).
+Uses an append-only JSON Lines file for storage (simple and effective for MVP):
+each save appends one {user_id: data} line, and the file is compacted when
+superseded lines outnumber live users. Writes happen on a background thread.
 """
+import atexit
 import json
 import os
+import queue
+import threading
 from threading import Lock
 from typing import Dict, Optional
 from logger import GLOBAL_LOGGER as log
 
+try:
+    import orjson
+    _HAS_ORJSON = True
+except Exception:
+    _HAS_ORJSON = False
+
+def _dumps(obj) -> bytes:
+    if _HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+_loads = orjson.loads if _HAS_ORJSON else json.loads
+
+def _parse_record(line: bytes) -> Optional[Dict]:
+    # None for anything that isn't a complete {user_id: data} object
+    try:
+        record = _loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+def _record_line(user_id: str, blob: bytes) -> bytes:
+    # Splice the already-serialized data into a {user_id: data} line
+    return b"{" + _dumps(user_id) + b":" + blob + b"}\n"
+
 class UserStore:
     def __init__(self, storage_path: str = "data/user_cache.json"):
         self.storage_path = storage_path
         self.lock = Lock()
+        self._records = 0 # lines currently in the file (live + superseded)
+        self._clean = True # False when unreadable records were found; disables auto-compaction
         self._ensure_storage()
+        # user_id -> serialized JSON blob; decoded on read, so cold users cost only their bytes
         self.cache = self._load()
 
+        # Saves only update the in-memory cache and queue the user id; a single
+        # background thread appends the lines so requests never wait on disk I/O
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="user-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
     def _ensure_storage(self):
         os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
         if not os.path.exists(self.storage_path):
-            with open(self.storage_path, 'w') as f:
-                json.dump({}, f)
+            open(self.storage_path, 'w').close()
 
-    def _load(self) -> Dict:
+    def _load(self) -> Dict[str, bytes]:
         try:
-            with open(self.storage_path, 'r') as f:
-                return json.load(f)
+            with open(self.storage_path, 'rb') as f:
+                text = f.read()
         except Exception as e:
             log.error(f"Failed to load user cache: {e}")
+            self._clean = False
             return {}
 
-    def _save(self):
+        lines = [line for line in text.splitlines() if line.strip()]
+        torn_tail = bool(text) and not text.endswith(b"\n")
+        cache = {}
+        # One {user_id: data} object per line; later lines win
+        for i, line in enumerate(lines):
+            record = _parse_record(line)
+            if record is None:
+                if i == 0:
+                    # Legacy whole-file JSON (pretty-printed dict); rewrite it as JSON Lines
+                    legacy = _parse_record(text)
+                    if legacy is not None:
+                        cache = {user_id: _dumps(data) for user_id, data in legacy.items()}
+                        self._compact(cache)
+                        return cache
+                if i == len(lines) - 1 and torn_tail and self._clean:
+                    # Partial last line from an interrupted append; the next compaction drops it
+                    log.warning("Skipping truncated user cache record", path=self.storage_path)
+                else:
+                    log.error("Skipping unreadable user cache record", path=self.storage_path, line=i + 1)
+                    self._clean = False
+                continue
+            for user_id, data in record.items():
+                cache[user_id] = _dumps(data)
+        self._records = len(lines)
+
+        if torn_tail:
+            # Start the next append on a fresh line
+            with open(self.storage_path, 'ab') as f:
+                f.write(b"\n")
+        return cache
+
+    def _save(self, user_ids):
         try:
             with self.lock:
-                with open(self.storage_path, 'w') as f:
-                    json.dump(self.cache, f, indent=2)
+                with open(self.storage_path, 'ab') as f:
+                    f.writelines(_record_line(uid, self.cache[uid]) for uid in user_ids)
+                self._records += len(user_ids)
+                # Never auto-compact over unreadable records; they'd be lost for good
+                if self._clean and self._records > 2 * len(self.cache):
+                    self._compact(self.cache)
         except Exception as e:
             log.error(f"Failed to save user cache: {e}")
 
+    def _compact(self, cache: Dict[str, bytes]):
+        """Rewrites the file with one line per live user (atomic replace)."""
+        tmp_path = self.storage_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.writelines(_record_line(user_id, blob) for user_id, blob in list(cache.items()))
+        os.replace(tmp_path, self.storage_path)
+        self._records = len(cache)
+        self._clean = True
+
+    def compact(self):
+        """Drops superseded lines from the storage file."""
+        try:
+            with self.lock:
+                self._compact(self.cache)
+        except Exception as e:
+            log.error(f"Failed to compact user cache: {e}")
+
+    def flush(self):
+        """Blocks until every queued save has been written."""
+        self._queue.join()
+
+    def _write_loop(self):
+        while True:
+            # Coalesce bursts: drain whatever is queued and write each user once
+            pending = [self._queue.get()]
+            while True:
+                try:
+                    pending.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._save(list(dict.fromkeys(pending)))
+            finally:
+                for _ in pending:
+                    self._queue.task_done()
+
     def get_user_data(self, user_id: str) -> Optional[Dict]:
         """Retrieve cached data for a user."""
-        return self.cache.get(user_id)
+        blob = self.cache.get(user_id)
+        return _loads(blob) if blob is not None else None
 
     def save_user_data(self, user_id: str, data: Dict):
         """Save/Update data for a user."""
-        self.cache[user_id] = data
-        self._save()
-        log.info(f"Updated cache for user: {user_id}")
+        self.cache[user_id] = _dumps(data)
+        self._queue.put(user_id)
+        log.info("Updated cache for user", user_id=user_id)
 
 # Singleton instance
 USER_STORE = UserStore()
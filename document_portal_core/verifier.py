@@ -7,75 +7,132 @@ candidate lookup. Includes a simple background-job scaffold for optional
 LLM-based verification (use Celery or other worker for production).
 """
 from __future__ import annotations
-import re
 import sys
+import threading
 import uuid
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from difflib import SequenceMatcher
+import numpy as np
 from logger import GLOBAL_LOGGER as log
 from exception.custom_exception import DocumentPortalException
 
 try:
-    from rapidfuzz import fuzz
+    from rapidfuzz import fuzz, process
     _HAS_RAPIDFUZZ = True
 except Exception:
     _HAS_RAPIDFUZZ = False
 
-# Simple in-memory job store for background verification results (demo only)
-JOB_STORE: Dict[str, Dict[str, Any]] = {}
+# Simple in-memory job store for background verification results (demo only).
+# Bounded: once MAX_JOBS entries exist the oldest job is evicted, so memory stays flat.
+MAX_JOBS = 10_000
+JOB_STORE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_JOB_STORE_LOCK = threading.Lock()
 
 
-def _normalize_text(s: str) -> str:
+def _store_job(job_id: str, entry: Dict[str, Any]) -> None:
+    with _JOB_STORE_LOCK:
+        JOB_STORE[job_id] = entry
+        while len(JOB_STORE) > MAX_JOBS:
+            JOB_STORE.popitem(last=False)
+
+
+_NORM_KEEP = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
+
+
+class _NormTable(dict):
+    """str.translate table: whitespace -> space, letters/digits -> lowercase a-z0-9, rest dropped.
+
+    Filled lazily per code point so non-ASCII input follows the same lower()-then-filter rule.
+    """
+
+    def __missing__(self, code: int) -> Optional[str]:
+        ch = chr(code)
+        if ch.isspace():
+            out = " "
+        else:
+            out = "".join(c for c in ch.lower() if c in _NORM_KEEP) or None
+        self[code] = out
+        return out
+
+
+_NORM_TABLE = _NormTable()
+
+
+def _normalize_document(s: str) -> str:
     if s is None:
         return ""
-    s = s.lower()
-    s = re.sub(r"\s+", " ", s)
-    s = re.sub(r"[^a-z0-9 ]", "", s)
-    return s.strip()
+    # One translate pass plus a split/join to collapse space runs (including those left by dropped punctuation)
+    return " ".join(s.translate(_NORM_TABLE).split())
+
+
+# Claims are short and repeat across requests, so they're cached; documents go through
+# _normalize_document directly so large texts aren't pinned in the cache
+_normalize_text = lru_cache(maxsize=256)(_normalize_document)
+
+
+def _sort_tokens(s: str) -> str:
+    # ratio() over sorted tokens is token_sort_ratio; sorting separately lets a document be
+    # sorted once for many claims (str.split also treats NBSP as a separator)
+    return " ".join(sorted(s.split()))
 
 
 def _fuzzy_score(a: str, b: str) -> float:
     if _HAS_RAPIDFUZZ:
         try:
-            return float(fuzz.token_sort_ratio(a, b))
+            return float(fuzz.ratio(_sort_tokens(a), _sort_tokens(b)))
         except Exception:
             pass
     # fallback
     return float(SequenceMatcher(None, a, b).ratio() * 100)
 
 
+def _fuzzy_scores(queries: List[str], document_text: str) -> List[float]:
+    """Scores many claims against one document; rapidfuzz batches them in a single C call
+    and the document tokens are sorted once rather than per claim."""
+    if _HAS_RAPIDFUZZ and queries:
+        try:
+            scores = process.cdist([_sort_tokens(q) for q in queries], [_sort_tokens(document_text)],
+                                   scorer=fuzz.ratio, dtype=np.float64, workers=-1)
+            return [float(score) for score in scores[:, 0]]
+        except Exception:
+            pass
+    return [_fuzzy_score(q, document_text) for q in queries]
+
+
+def _grade(score: float, pass_at: float, warn_at: float, method: str) -> Dict[str, Any]:
+    if score >= pass_at:
+        return {"result": "pass", "score": score, "method": method}
+    elif score >= warn_at:
+        return {"result": "warn", "score": score, "method": method}
+    else:
+        return {"result": "fail", "score": score, "method": method}
+
+
 class Verifier:
     """Performs verification checks between claimed metadata and document text."""
 
+    # (pass threshold, warn threshold, method) for claims that fall through to fuzzy scoring
+    ENTITY_FUZZY = (90, 70, "fuzzy")
+    CLAUSE_FUZZY = (85, 60, "semantic/fuzzy")
+
     def __init__(self, faiss_index_path: Optional[str] = None) -> None:
         self.faiss_index_path = faiss_index_path
 
-    def verify_entity(self, claimed: str, document_text: str) -> Dict[str, Any]:
+    def verify_entity(self, claimed: str, document_text: str,
+                      norm_document_text: Optional[str] = None) -> Dict[str, Any]:
         """Verify a single claimed entity against the document text.
 
+        Pass norm_document_text (from _normalize_document) when checking many claims
+        against the same document to avoid re-normalizing it per claim.
         Returns a dict with result, score, method, and matched excerpt (if any).
         """
         try:
-            norm_claim = _normalize_text(claimed)
-            if not norm_claim:
-                return {"result": "missing", "score": 0.0, "method": "none"}
-
-            # exact substring
-            if claimed in document_text:
-                return {"result": "pass", "score": 100.0, "method": "exact", "excerpt": claimed}
-
-            # normalized exact
-            if _normalize_text(claimed) in _normalize_text(document_text):
-                return {"result": "pass", "score": 95.0, "method": "normalized_exact"}
-
-            # fuzzy
-            score = _fuzzy_score(claimed, document_text)
-            if score >= 90:
-                return {"result": "pass", "score": score, "method": "fuzzy"}
-            elif score >= 70:
-                return {"result": "warn", "score": score, "method": "fuzzy"}
-            else:
-                return {"result": "fail", "score": score, "method": "fuzzy"}
+            res = self._precheck_entity(claimed, document_text, norm_document_text)
+            if res is not None:
+                return res
+            return _grade(_fuzzy_score(claimed, document_text), *self.ENTITY_FUZZY)
         except Exception as e:
             log.error("Verifier.verify_entity failed", error=str(e))
             raise DocumentPortalException("Verifier failed", sys)
@@ -86,19 +143,40 @@ class Verifier:
         Returns result, score, and evidence excerpt.
         """
         try:
-            if expected_text in document_text:
-                return {"result": "pass", "score": 100.0, "method": "exact", "excerpt": expected_text}
-            score = _fuzzy_score(expected_text, document_text)
-            if score >= 85:
-                return {"result": "pass", "score": score, "method": "semantic/fuzzy"}
-            elif score >= 60:
-                return {"result": "warn", "score": score, "method": "semantic/fuzzy"}
-            else:
-                return {"result": "fail", "score": score, "method": "semantic/fuzzy"}
+            res = self._precheck_clause(expected_text, document_text)
+            if res is not None:
+                return res
+            return _grade(_fuzzy_score(expected_text, document_text), *self.CLAUSE_FUZZY)
         except Exception as e:
             log.error("Verifier.verify_clause failed", error=str(e))
             raise DocumentPortalException("Verifier failed", sys)
 
+    @staticmethod
+    def _precheck_entity(claimed: str, document_text: str,
+                         norm_document_text: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Cheap checks for an entity; returns None when fuzzy scoring is needed."""
+        norm_claim = _normalize_text(claimed)
+        if not norm_claim:
+            return {"result": "missing", "score": 0.0, "method": "none"}
+
+        # normalized exact first: a raw substring hit always implies a normalized one,
+        # so the raw scan only runs to tell "exact" from "normalized_exact"
+        if norm_document_text is None:
+            norm_document_text = _normalize_document(document_text)
+        if norm_claim not in norm_document_text:
+            return None
+
+        # exact substring
+        if claimed in document_text:
+            return {"result": "pass", "score": 100.0, "method": "exact", "excerpt": claimed}
+        return {"result": "pass", "score": 95.0, "method": "normalized_exact"}
+
+    @staticmethod
+    def _precheck_clause(expected_text: str, document_text: str) -> Optional[Dict[str, Any]]:
+        if expected_text in document_text:
+            return {"result": "pass", "score": 100.0, "method": "exact", "excerpt": expected_text}
+        return None
+
     def quick_verify(self, claims: Dict[str, Any], document_text: str) -> Dict[str, Any]:
         """Run a quick verification pass for common claim structures.
 
@@ -106,6 +184,19 @@ class Verifier:
         """
         report: Dict[str, Any] = {"checks": [], "summary": {}}
         try:
+            # Collect every check first; those the cheap prechecks can't settle are
+            # fuzzy-scored against the document in one batch below.
+            pending = [] # (check, grading) for checks awaiting a fuzzy score
+            # Normalize the document once for all claims
+            norm_doc = _normalize_document(document_text)
+
+            def add_check(check: Dict[str, Any], res: Optional[Dict[str, Any]], grading: tuple) -> None:
+                if res is None:
+                    pending.append((check, grading))
+                else:
+                    check.update(res)
+                report["checks"].append(check)
+
             # Parties
             for party_key in ("party_a", "party_b"):
                 party = claims.get(party_key)
@@ -114,19 +205,23 @@ class Verifier:
                 name = party.get("name")
                 address = party.get("address")
                 if name:
-                    res = self.verify_entity(name, document_text)
-                    report["checks"].append({"id": f"{party_key}_name", "type": "party_name", "value": name, **res})
+                    add_check({"id": f"{party_key}_name", "type": "party_name", "value": name},
+                              self._precheck_entity(name, document_text, norm_doc), self.ENTITY_FUZZY)
                 if address:
-                    res = self.verify_entity(address, document_text)
-                    report["checks"].append({"id": f"{party_key}_address", "type": "address", "value": address, **res})
+                    add_check({"id": f"{party_key}_address", "type": "address", "value": address},
+                              self._precheck_entity(address, document_text, norm_doc), self.ENTITY_FUZZY)
 
             # Expected clause changes
             for idx, change in enumerate(claims.get("expected_changes", []) or []):
                 expected_text = change.get("expected_text") or change.get("clause")
                 if not expected_text:
                     continue
-                res = self.verify_clause(expected_text, document_text)
-                report["checks"].append({"id": f"clause_{idx}", "type": "clause_change", "value": expected_text, **res})
+                add_check({"id": f"clause_{idx}", "type": "clause_change", "value": expected_text},
+                          self._precheck_clause(expected_text, document_text), self.CLAUSE_FUZZY)
+
+            scores = _fuzzy_scores([check["value"] for check, _ in pending], document_text)
+            for (check, grading), score in zip(pending, scores):
+                check.update(_grade(score, *grading))
 
             # Compute simple summary
             scores = [c.get("score", 0) for c in report["checks"] if isinstance(c.get("score", None), (int, float))]
@@ -146,18 +241,19 @@ class Verifier:
         This function stores a placeholder result and returns job_id immediately.
         """
         job_id = str(uuid.uuid4())
-        JOB_STORE[job_id] = {"status": "queued", "result": None}
+        job = {"status": "queued", "result": None}
+        _store_job(job_id, job)
 
         # For demo, we run a synchronous placeholder that marks job as completed.
         # In production, this should be executed by a worker process.
         try:
             # Placeholder LLM check: mark as completed with existing quick_verify
             result = self.quick_verify(claims, document_text)
-            JOB_STORE[job_id]["status"] = "completed"
-            JOB_STORE[job_id]["result"] = {"llm_enhanced": True, "base": result}
+            job["status"] = "completed"
+            job["result"] = {"llm_enhanced": True, "base": result}
         except Exception as e:
-            JOB_STORE[job_id]["status"] = "failed"
-            JOB_STORE[job_id]["result"] = {"error": str(e)}
+            job["status"] = "failed"
+            job["result"] = {"error": str(e)}
 
         return job_id
 
@@ -1,3 +1,5 @@
+import logging
+
 from .custom_logger import CustomLogger
 
 # Wrap the standard logger so callers can pass keyword metadata without raising
@@ -14,18 +16,27 @@ class _GlobalLogger:
 			meta = " | <meta>"
 		return msg + meta
 
+	# Metadata is only formatted when the record would actually be emitted
+	def debug(self, msg: str, **kwargs) -> None:
+		if self._logger.isEnabledFor(logging.DEBUG):
+			self._logger.debug(self._format(msg, kwargs))
+
 	def info(self, msg: str, **kwargs) -> None:
-		self._logger.info(self._format(msg, kwargs))
+		if self._logger.isEnabledFor(logging.INFO):
+			self._logger.info(self._format(msg, kwargs))
 
 	def warning(self, msg: str, **kwargs) -> None:
-		self._logger.warning(self._format(msg, kwargs))
+		if self._logger.isEnabledFor(logging.WARNING):
+			self._logger.warning(self._format(msg, kwargs))
 
 	def error(self, msg: str, **kwargs) -> None:
-		self._logger.error(self._format(msg, kwargs))
+		if self._logger.isEnabledFor(logging.ERROR):
+			self._logger.error(self._format(msg, kwargs))
 
 	def exception(self, msg: str, **kwargs) -> None:
 		# include traceback
-		self._logger.exception(self._format(msg, kwargs))
+		if self._logger.isEnabledFor(logging.ERROR):
+			self._logger.exception(self._format(msg, kwargs))
 
 
 # Global logger instance for library modules
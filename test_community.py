@@ -1,14 +1,14 @@
 
 import requests
-import os
 import json
+from pathlib import Path
 
 API_URL = "http://localhost:8001/extract/invoice"
 IMG_DIR = "/home/currycreations/Desktop/New Folder/drive-download-20251225T035218Z-1-001"
 FILE = "AE04739B-4F62-4218-B881-136822A7861A.JPG"
 
 print(f"Testing {FILE}...")
-files = [('files', (FILE, open(os.path.join(IMG_DIR, FILE), 'rb'), 'image/jpeg'))]
+files = [('files', (FILE, Path(IMG_DIR, FILE).read_bytes(), 'image/jpeg'))]
 
 try:
     resp = requests.post(API_URL, files=files)
@@ -1,43 +1,52 @@
 import os
-import requests
+import asyncio
+import httpx
 import json
 from pathlib import Path
 
 # Config
 IMAGE_DIR = "/home/currycreations/Desktop/New Folder/drive-download-20251225T035218Z-1-001"
 API_URL = "http://localhost:8000/extract/invoice"
+MAX_CONCURRENCY = 8 # In-flight requests; match the server's worker capacity
 
-def test_bills():
-    print(f"--- Processing Bills in {IMAGE_DIR} ---")
-    files = [f for f in os.listdir(IMAGE_DIR) if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
-    
-    results = []
-    
-    for filename in files:
-        filepath = os.path.join(IMAGE_DIR, filename)
+async def process_bill(client, sem, filename):
+    filepath = os.path.join(IMAGE_DIR, filename)
+    async with sem:
         print(f"Processing: {filename}...")
-        
         try:
             with open(filepath, 'rb') as f:
-                response = requests.post(API_URL, files={'file': f})
-                
-            if response.status_code == 200:
-                data = response.json()
-                extracted = data.get("extracted", {}).get("data", {})
-                confidence = data.get("extracted", {}).get("confidence", 0)
-                
-                print(f"  > Success! Conf: {confidence}%")
-                print(f"  > Data: {json.dumps(extracted, indent=2)}")
-                results.append({
-                    "file": filename,
-                    "data": extracted,
-                    "confidence": confidence
-                })
-            else:
-                print(f"  > Failed: {response.text}")
-                
+                response = await client.post(API_URL, files={'file': f})
         except Exception as e:
-            print(f"  > Error: {e}")
+            print(f"  > Error ({filename}): {e}")
+            return None
+
+    if response.status_code != 200:
+        print(f"  > Failed ({filename}): {response.text}")
+        return None
+
+    data = response.json()
+    extracted = data.get("extracted", {}).get("data", {})
+    confidence = data.get("extracted", {}).get("confidence", 0)
+
+    print(f"  > Success ({filename})! Conf: {confidence}%")
+    print(f"  > Data: {json.dumps(extracted, indent=2)}")
+    return {
+        "file": filename,
+        "data": extracted,
+        "confidence": confidence
+    }
+
+async def process_bills(files):
+    # Requests overlap instead of running back to back; the semaphore bounds server load
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    async with httpx.AsyncClient(timeout=120) as client:
+        return await asyncio.gather(*(process_bill(client, sem, f) for f in files))
+
+def test_bills():
+    print(f"--- Processing Bills in {IMAGE_DIR} ---")
+    files = [f for f in os.listdir(IMAGE_DIR) if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
+    
+    results = [r for r in asyncio.run(process_bills(files)) if r is not None]
             
     print("\n--- Summary ---")
     print(f"Processed {len(files)} files.")
@@ -1,7 +1,7 @@
 
 import requests
-import os
 import json
+from pathlib import Path
 
 API_URL = "http://localhost:8000/extract/invoice"
 IMG_DIR = "/home/currycreations/Desktop/New Folder/drive-download-20251225T035218Z-1-001"
@@ -11,9 +11,10 @@ IMG_DIR = "/home/currycreations/Desktop/New Folder/drive-download-20251225T03521
 file1 = "E3E271D3-F374-4981-8DEE-390210976C9E.JPG"
 file2 = "D73CB49D-509F-4F01-8DE2-7127319EB828.JPG"
 
+# Read the images up front so no file handles are left open
 files_payload = [
-    ('files', (file1, open(os.path.join(IMG_DIR, file1), 'rb'), 'image/jpeg')),
-    ('files', (file2, open(os.path.join(IMG_DIR, file2), 'rb'), 'image/jpeg'))
+    ('files', (file1, Path(IMG_DIR, file1).read_bytes(), 'image/jpeg')),
+    ('files', (file2, Path(IMG_DIR, file2).read_bytes(), 'image/jpeg'))
 ]
 
 print(f"Sending Batch: {file1} + {file2}")
@@ -1,7 +1,7 @@
 
 import requests
-import os
 import json
+from pathlib import Path
 
 API_URL = "http://localhost:8001/extract/invoice"
 IMG_DIR = "/home/currycreations/Desktop/New Folder/drive-download-20251225T035218Z-1-001"
@@ -14,9 +14,8 @@ audit_files = [
     "C60280D0-425C-4FFB-A8B2-3823A811E81E.JPG"
 ]
 
-files_payload = []
-for f in audit_files:
-    files_payload.append(('files', (f, open(os.path.join(IMG_DIR, f), 'rb'), 'image/jpeg')))
+# Read the images up front so no file handles are left open
+files_payload = [('files', (f, Path(IMG_DIR, f).read_bytes(), 'image/jpeg')) for f in audit_files]
 
 print(f"Sending Batch: 4 Night Audit Pages")
 
@@ -11,3 +11,12 @@ def mock_env_vars(monkeypatch):
     monkeypatch.setenv("GEMINI_API_KEY", "TEST_KEY")
 
 # If needed, patch external calls globally
+
+# One TestClient for the whole session: the app and its router are built and the
+# ASGI lifespan runs once instead of per test module
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from api.main import app
+    with TestClient(app) as c:
+        yield c
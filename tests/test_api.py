@@ -1,21 +1,14 @@
 """
 Integration Tests for Document Portal API.
 Tests the endpoints: /extract/id, /verify/contract, /analyze/compliance.
-Mocks the 'Ingestion.ingest' method to avoid dependency on Tesseract/OCR during testing.
+Mocks the app's Ingestion entry points to avoid dependency on Tesseract/OCR during testing.
 """
 import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 import json
-import sys
-import os
 
-# Add parent dir to path to import api
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from api.main import app
-
-client = TestClient(app)
+# Endpoint tests share the session TestClient; keep them on one xdist worker
+pytestmark = pytest.mark.xdist_group("api")
 
 # Mock Data
 MOCK_ID_TEXT = """
@@ -32,35 +25,26 @@ TEXAS RESIDENTIAL LEASE AGREEMENT
 2. Security deposit will be returned within 30 days.
 """
 
+CLAIMS_JSON = json.dumps({
+    "expected_changes": [{"expected_text": "Security deposit"}]
+})
+
 @pytest.fixture
 def mock_ingest():
-    # Patch both processing methods to cover ID (image) and Contracts (PDF)
-    with patch("document_portal_core.ingestion.Ingestion._process_image") as mock_img, \
-         patch("document_portal_core.ingestion.Ingestion._process_pdf") as mock_pdf:
-        
-        # We return a helper that sets return values for both
-        mock = MagicMock()
-        
-        def set_return_value(text):
-            mock_img.return_value = text
-            mock_pdf.return_value = text
-            
-        mock.return_value = set_return_value # Not used directly but consistent
-        mock.set_text = set_return_value
-        
-        # Default behavior:
-        mock_img.return_value = ""
-        mock_pdf.return_value = ""
-        
+    # Contracts go through ingestion.ingest(), IDs through ingestion._process_image();
+    # one mock serves both entry points of the app's shared Ingestion instance
+    with patch("api.main.ingestion.ingest", return_value="") as mock, \
+         patch("api.main.ingestion._process_image", new=mock):
+        mock.set_text = lambda text: setattr(mock, "return_value", text)
         yield mock
 
-def test_health_check():
+def test_health_check(client):
     """Verify API is running."""
     response = client.get("/")
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
 
-def test_extract_id_endpoint(mock_ingest):
+def test_extract_id_endpoint(client, mock_ingest):
     """Test ID extraction endpoint."""
     mock_ingest.set_text(MOCK_ID_TEXT)
     
@@ -74,16 +58,12 @@ def test_extract_id_endpoint(mock_ingest):
     assert data["extracted"]["data"]["license_number"] == "87654321"
     assert data["extracted"]["data"]["dob"] == "05/15/1990"
 
-def test_verify_contract_endpoint(mock_ingest):
+def test_verify_contract_endpoint(client, mock_ingest):
     """Test Contract Verification endpoint."""
     mock_ingest.set_text(MOCK_LEASE_TEXT)
     
-    claims = {
-        "expected_changes": [{"expected_text": "Security deposit"}]
-    }
-    
     files = {"file": ("lease.pdf", b"fake_pdf_bytes", "application/pdf")}
-    data = {"claims_json": json.dumps(claims)}
+    data = {"claims_json": CLAIMS_JSON}
     
     response = client.post("/verify/contract", files=files, data=data)
     
@@ -97,7 +77,7 @@ def test_verify_contract_endpoint(mock_ingest):
     assert res_data["compliance"]["compliance_score"] > 0
     assert "Texas, USA" in res_data["compliance"]["jurisdiction"]
 
-def test_analyze_compliance_endpoint(mock_ingest):
+def test_analyze_compliance_endpoint(client, mock_ingest):
     """Test Compliance Analysis endpoint."""
     mock_ingest.set_text(MOCK_LEASE_TEXT)
     
@@ -109,3 +89,15 @@ def test_analyze_compliance_endpoint(mock_ingest):
     data = response.json()
     # It might return Jurisdiction detected
     assert data.get("jurisdiction") == "Texas, USA"
+
+def test_extract_id_endpoint_rejects_unreadable_photo(client):
+    """A blank photo is reported as unreadable, not as an ID with no fields."""
+    import cv2
+    import numpy as np
+    ok, blank = cv2.imencode(".png", np.full((300, 400, 3), 128, dtype=np.uint8))
+    files = {"file": ("id.png", blank.tobytes(), "image/png")}
+
+    response = client.post("/extract/id", files=files)
+
+    assert response.status_code == 422
+    assert "blank" in response.json()["detail"]
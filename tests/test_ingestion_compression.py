@@ -1,50 +1,46 @@
 
 import pytest
-from unittest.mock import MagicMock, patch
+from PIL import Image
 from document_portal_core.ingestion import Ingestion
-from pathlib import Path
 
-@pytest.fixture
+# Ingestion holds no per-test state; every test works on its own tmp_path file
+@pytest.fixture(scope="module")
 def ingestion():
     return Ingestion()
 
-@patch("document_portal_core.ingestion.Image")
-def test_compress_image_resizes(mock_image, ingestion):
-    # Setup Mock Image
-    mock_img_instance = MagicMock()
-    mock_img_instance.size = (4000, 3000) # Large image
-    mock_img_instance.mode = 'RGB'
+def test_compress_image_resizes(tmp_path, ingestion):
+    # Large image
+    path = tmp_path / "large.jpg"
+    Image.new("RGB", (4000, 3000), (240, 240, 240)).save(path, "JPEG")
     
-    # Context Manager for Image.open
-    mock_image.open.return_value.__enter__.return_value = mock_img_instance
+    ingestion.compress_image(path)
     
-    # Path Mock
-    dummy_path = Path("dummy.jpg")
-    
-    ingestion.compress_image(dummy_path)
-    
-    # Verify thumbnail called (Resize)
-    mock_img_instance.thumbnail.assert_called()
-    # Check max dimension
-    args, _ = mock_img_instance.thumbnail.call_args
-    assert args[0][0] == 2048
+    # Max dimension capped at 2048, aspect ratio kept
+    with Image.open(path) as out:
+        assert out.size == (2048, 1536)
 
-@patch("document_portal_core.ingestion.Image")
-def test_compress_image_converts_rgba(mock_image, ingestion):
-    # Setup Mock Image
-    mock_img_instance = MagicMock()
-    mock_img_instance.size = (1000, 1000) # Small enough
-    mock_img_instance.mode = 'RGBA' # Needs conversion
-    
-    # Return a converted mock when convert is called
-    converted_mock = MagicMock()
-    mock_img_instance.convert.return_value = converted_mock
-    
-    mock_image.open.return_value.__enter__.return_value = mock_img_instance
+def test_compress_image_converts_rgba(tmp_path, ingestion):
+    # Small enough, but RGBA needs conversion before saving as JPEG
+    path = tmp_path / "opaque.png"
+    Image.new("RGBA", (1000, 1000), (10, 120, 200, 255)).save(path)
     
-    ingestion.compress_image(Path("dummy.png"))
+    ingestion.compress_image(path)
     
-    # Verify conversion to RGB
-    mock_img_instance.convert.assert_called_with('RGB')
-    # Verify save called on CONVERTED image
-    converted_mock.save.assert_called()
+    with Image.open(path) as out:
+        assert out.format == "JPEG"
+        assert out.mode == "RGB"
+        assert out.size == (1000, 1000)
+
+def test_compress_image_flattens_transparency_onto_white(tmp_path, ingestion):
+    path = tmp_path / "logo.png"
+    img = Image.new("RGBA", (64, 64), (0, 0, 0, 0)) # Fully transparent
+    img.paste((200, 0, 0, 255), (0, 0, 32, 64))     # Opaque red left half
+    img.save(path)
+
+    ingestion.compress_image(path)
+
+    with Image.open(path) as out:
+        assert out.mode == "RGB"
+        r, g, b = out.getpixel((48, 32))
+        assert min(r, g, b) > 240 # transparent area became white, not black
+        assert out.getpixel((8, 32))[0] > 150
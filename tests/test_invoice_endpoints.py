@@ -1,18 +1,17 @@
 
 import pytest
-from fastapi.testclient import TestClient
 from unittest.mock import MagicMock, patch
-from api.main import app
 from pathlib import Path
 
-client = TestClient(app)
+# Endpoint tests share the session TestClient; keep them on one xdist worker
+pytestmark = pytest.mark.xdist_group("api")
 
 @pytest.fixture
 def mock_gemini():
     with patch("api.main.gemini_extractor") as mock:
         yield mock
 
-def test_extract_invoice_batch(mock_gemini):
+def test_extract_invoice_batch(client, mock_gemini):
     # Mock Gemini Response
     mock_gemini.extract_data.return_value = {
         "data": {
@@ -0,0 +1,28 @@
+"""
+Unit tests for the InvoiceExtractor regex extraction in document_portal_core.
+"""
+import pytest
+from document_portal_core.invoice_extractor import InvoiceExtractor
+
+@pytest.mark.parametrize("text, expected", [
+    ("Subtotal 10.00\nBalance Due $12.50\nTotal Sales: 99.99", "99.99"),
+    ("Total 10.00\nInvoice Total 20.00", "20.00"),
+    ("Total Amount Due 7,25", "7.25"),
+    ("Grand Total: $1,234.56", "1234.56"),
+    ("Balance Due 5.00", "5.00"),
+])
+def test_total_amount_priority(text, expected):
+    assert InvoiceExtractor().extract_invoice_data(text)["data"]["total_amount"] == expected
+
+@pytest.mark.parametrize("text, expected", [
+    ("Printed 2024-01-05\nDate: 02/03/2024\nDue Date 03/04/2024", "03/04/2024"),
+    ("Date 1/2/24", "1/2/24"),
+    ("Printed 2024-01-05", "2024-01-05"),
+])
+def test_invoice_date_priority(text, expected):
+    assert InvoiceExtractor().extract_invoice_data(text)["data"]["invoice_date"] == expected
+
+def test_lowercase_text_and_classification():
+    result = InvoiceExtractor().extract_invoice_data("acme fuel\ninvoice no: ab-123\npump 4 shift close")
+    assert result["data"]["invoice_number"] == "AB-123"
+    assert result["doc_type"] == "shift_report"
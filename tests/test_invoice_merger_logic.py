@@ -131,3 +131,45 @@ def test_merge_headerless_shift_report(merger):
     merged = merger.merge_results(results)
     assert len(merged) == 1
     assert merged[0]["extracted"]["data"]["shift_report_details"]["fuel_sales"] == 50
+
+def test_merge_does_not_mutate_input_pages(merger):
+    import copy
+    results = [
+        {
+            "extracted": {
+                "data": {
+                    "invoice_details": {"number": "INV-300"},
+                    "vendor": {"name": "Test Vendor"},
+                    "shift_report_details": {"total_sales": None},
+                    "line_items": [{"description": "Item 1"}]
+                }
+            }
+        },
+        {
+            "extracted": {
+                "data": {
+                    "invoice_details": {"number": "INV-300"},
+                    "vendor": {"phone": "555-0100"},
+                    "shift_report_details": {"total_sales": 10},
+                    "line_items": [{"description": "Item 2"}]
+                }
+            }
+        }
+    ]
+    snapshot = copy.deepcopy(results)
+
+    merged = merger.merge_results(results)
+    data = merged[0]["extracted"]["data"]
+    assert data["vendor"]["phone"] == "555-0100"
+    assert data["shift_report_details"]["total_sales"] == 10
+    assert len(data["line_items"]) == 2
+    assert results == snapshot
+
+def test_merge_orphan_by_total_normalizes_amounts(merger):
+    results = [
+        {"extracted": {"data": {"invoice_details": {"number": "INV-400"}, "financials": {"total_amount": 55.5}}}},
+        {"extracted": {"data": {"invoice_details": {"number": None}, "financials": {"total_amount": "55.50"}}}},
+    ]
+    merged = merger.merge_results(results)
+    assert len(merged) == 1
+    assert merged[0]["merged_page_count"] == 2
@@ -12,3 +12,14 @@ def test_rag_init():
             self.chain = lambda payload: "dummy answer"
     rag = DummyRAG(session_id="test")
     assert rag.session_id == "test"
+
+def test_rag_defers_llm_load_until_used():
+    loads = []
+    class DummyRAG(ConversationalRAG):
+        def _load_llm(self):
+            loads.append(1)
+            return object()
+    rag = DummyRAG(session_id="test")
+    assert loads == []
+    assert rag.llm is rag.llm
+    assert loads == [1]
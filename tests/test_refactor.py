@@ -1,6 +1,4 @@
 import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from document_portal_core.extractor import IDExtractor
 from document_portal_core.compliance import ComplianceChecker
@@ -0,0 +1,17 @@
+"""
+Unit tests for the ResultManager module in document_portal_core.
+"""
+import json
+from document_portal_core.result_manager import ResultManager
+
+def test_log_result_writes_record_after_flush(tmp_path):
+    manager = ResultManager(base_dir=str(tmp_path))
+    manager.log_result("test-model", "scan.png", {"total": 1.5}, duration_seconds=0.123456, confidence=90)
+    manager.flush()
+
+    files = list((tmp_path / "test-model").glob("*_scan.json"))
+    assert len(files) == 1
+    record = json.loads(files[0].read_text())
+    assert record["extraction"] == {"total": 1.5}
+    assert record["metadata"]["duration_seconds"] == 0.1235
+    assert record["metadata"]["confidence_score"] == 90
@@ -0,0 +1,77 @@
+"""
+Unit tests for the DocumentScanner module in document_portal_core.
+"""
+import cv2
+import numpy as np
+from document_portal_core.scanner import DocumentScanner
+
+def _write(tmp_path, img, name="doc.png"):
+    path = tmp_path / name
+    cv2.imwrite(str(path), img)
+    return str(path)
+
+def test_scan_document_warps_quadrilateral(tmp_path):
+    # White page (400x300) on a dark background, slightly skewed
+    img = np.zeros((600, 800, 3), dtype=np.uint8)
+    page = np.array([[210, 140], [610, 160], [600, 460], [200, 450]], dtype=np.int32)
+    cv2.fillPoly(img, [page], (255, 255, 255))
+    out = str(tmp_path / "out.png")
+
+    result = DocumentScanner().scan_document(_write(tmp_path, img), out)
+
+    assert result == out
+    scanned = cv2.imread(out)
+    h, w = scanned.shape[:2]
+    assert 380 <= w <= 420
+    assert 280 <= h <= 320
+
+def test_scan_document_blank_image_returns_original(tmp_path):
+    img = np.full((300, 400, 3), 255, dtype=np.uint8)
+    out = str(tmp_path / "out.png")
+
+    DocumentScanner().scan_document(_write(tmp_path, img), out)
+
+    assert cv2.imread(out).shape == img.shape
+
+def test_scan_document_maps_proxy_corners_back(tmp_path):
+    # Tall photo: detection runs on a small proxy, the warp on the 1500px working image
+    img = np.zeros((3000, 2000, 3), dtype=np.uint8)
+    page = np.array([[400, 500], [1600, 560], [1580, 2500], [420, 2450]], dtype=np.int32)
+    cv2.fillPoly(img, [page], (255, 255, 255))
+    out = str(tmp_path / "out.png")
+
+    DocumentScanner().scan_document(_write(tmp_path, img), out)
+
+    h, w = cv2.imread(out).shape[:2]
+    assert 580 <= w <= 620
+    assert 960 <= h <= 1010
+
+def test_scan_document_finds_page_inside_larger_outline(tmp_path):
+    # Page lying on a round table: the table's outline encloses the page's
+    img = np.zeros((600, 800, 3), dtype=np.uint8)
+    cv2.ellipse(img, (400, 300), (390, 290), 0, 0, 360, (120, 80, 40), -1)
+    page = np.array([[250, 170], [560, 185], [550, 430], [240, 420]], dtype=np.int32)
+    cv2.fillPoly(img, [page], (255, 255, 255))
+    out = str(tmp_path / "out.png")
+
+    DocumentScanner().scan_document(_write(tmp_path, img), out)
+
+    h, w = cv2.imread(out).shape[:2]
+    assert 290 <= w <= 330
+    assert 230 <= h <= 265
+
+def test_find_document_contour_accepts_sparse_outline():
+    # A plain page on a plain background yields only its outline; well under 1% edge pixels
+    img = np.zeros((500, 700), dtype=np.uint8)
+    page = cv2.boxPoints(((350, 250), (230, 230), 45)).astype(np.int32)
+    cv2.fillPoly(img, [page], 255)
+    edges = cv2.Canny(cv2.GaussianBlur(img, (5, 5), 0), 75, 200)
+
+    assert cv2.countNonZero(edges) < 0.01 * edges.size
+    assert DocumentScanner()._find_document_contour(edges) is not None
+
+def test_find_document_contour_skips_blank_frame():
+    edges = np.zeros((500, 700), dtype=np.uint8)
+    edges[250, 300:310] = 255
+
+    assert DocumentScanner()._find_document_contour(edges) is None
@@ -0,0 +1,87 @@
+"""
+Unit tests for the UserStore module in document_portal_core.
+"""
+import json
+from document_portal_core.user_store import UserStore
+
+def test_save_appends_and_reloads(tmp_path):
+    path = tmp_path / "user_cache.json"
+    store = UserStore(storage_path=str(path))
+    store.save_user_data("u1", {"name": "Alice"})
+    store.save_user_data("u2", {"name": "Bob"})
+    store.flush()
+
+    assert len(path.read_text().splitlines()) == 2
+    assert UserStore(storage_path=str(path)).get_user_data("u2") == {"name": "Bob"}
+
+def test_superseded_lines_are_compacted(tmp_path):
+    path = tmp_path / "user_cache.json"
+    store = UserStore(storage_path=str(path))
+    for i in range(5):
+        store.save_user_data("u1", {"visits": i})
+        store.flush()
+
+    assert len(path.read_text().splitlines()) <= 2
+    assert UserStore(storage_path=str(path)).get_user_data("u1") == {"visits": 4}
+
+def test_legacy_json_file_is_migrated(tmp_path):
+    path = tmp_path / "user_cache.json"
+    path.write_text(json.dumps({"u1": {"name": "Alice"}, "u2": {"name": "Bob"}}, indent=2))
+
+    store = UserStore(storage_path=str(path))
+    store.save_user_data("u3", {"name": "Carol"})
+    store.flush()
+
+    reloaded = UserStore(storage_path=str(path))
+    assert [reloaded.get_user_data(u)["name"] for u in ("u1", "u2", "u3")] == ["Alice", "Bob", "Carol"]
+
+def test_save_does_not_block_on_disk(tmp_path):
+    path = tmp_path / "user_cache.json"
+    store = UserStore(storage_path=str(path))
+    with store.lock:  # writer is stalled until the lock is released
+        store.save_user_data("u1", {"name": "Alice"})
+        assert store.get_user_data("u1") == {"name": "Alice"}
+    store.flush()
+
+    assert json.loads(path.read_text()) == {"u1": {"name": "Alice"}}
+
+def test_get_returns_a_fresh_copy(tmp_path):
+    store = UserStore(storage_path=str(tmp_path / "user_cache.json"))
+    store.save_user_data("u1", {"name": "Alice"})
+
+    store.get_user_data("u1")["name"] = "Mallory"
+
+    assert store.get_user_data("u1") == {"name": "Alice"}
+    assert store.get_user_data("missing") is None
+
+def test_torn_trailing_line_keeps_existing_users(tmp_path):
+    path = tmp_path / "user_cache.json"
+    store = UserStore(storage_path=str(path))
+    for i in range(3):
+        store.save_user_data(f"u{i}", {"n": i})
+    store.flush()
+    with open(path, "ab") as f:
+        f.write(b'{"u9": {"n"')  # crash mid-append
+
+    store = UserStore(storage_path=str(path))
+    assert [store.get_user_data(f"u{i}") for i in range(3)] == [{"n": 0}, {"n": 1}, {"n": 2}]
+    store.save_user_data("new", {"n": 9})
+    store.flush()
+
+    reloaded = UserStore(storage_path=str(path))
+    assert [reloaded.get_user_data(u) for u in ("u0", "u2", "new")] == [{"n": 0}, {"n": 2}, {"n": 9}]
+    assert reloaded.get_user_data("u9") is None
+
+def test_unreadable_records_are_skipped_and_kept(tmp_path):
+    path = tmp_path / "user_cache.json"
+    path.write_bytes(b'{"u1": {"n": 1}}\n[1, 2]\n{"u2": {"n": 2}}\n')
+
+    store = UserStore(storage_path=str(path))
+    assert store.get_user_data("u2") == {"n": 2}
+    for i in range(5):
+        store.save_user_data("u1", {"n": i})
+        store.flush()
+
+    # No auto-compaction while an unreadable record is on disk
+    assert b"[1, 2]" in path.read_bytes()
+    assert UserStore(storage_path=str(path)).get_user_data("u1") == {"n": 4}
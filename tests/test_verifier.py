@@ -41,3 +41,28 @@ def test_quick_verify_and_enqueue():
     assert isinstance(job_id, str)
     job = v.get_job_result(job_id)
     assert job["status"] in ("completed", "failed")
+
+
+def test_quick_verify_batch_scores_match_single_checks():
+    v = Verifier()
+    doc = "This agreement is made with International Business Machines Incorporated of Armonk."
+    claims = {
+        "party_a": {"name": "IBM Corp", "address": "Armonk, New York"},
+        "expected_changes": [{"expected_text": "agreement made with International Business Machines"}]
+    }
+    checks = v.quick_verify(claims, doc)["checks"]
+    assert [c["id"] for c in checks] == ["party_a_name", "party_a_address", "clause_0"]
+    for check, single in zip(checks, [v.verify_entity("IBM Corp", doc),
+                                      v.verify_entity("Armonk, New York", doc),
+                                      v.verify_clause(claims["expected_changes"][0]["expected_text"], doc)]):
+        assert {k: check[k] for k in single} == single
+
+
+def test_job_store_evicts_oldest(monkeypatch):
+    from document_portal_core import verifier as verifier_module
+    monkeypatch.setattr(verifier_module, "MAX_JOBS", 2)
+    monkeypatch.setattr(verifier_module, "JOB_STORE", verifier_module.OrderedDict())
+    v = Verifier()
+    job_ids = [v.enqueue_llm_verification({}, "doc") for _ in range(3)]
+    assert v.get_job_result(job_ids[0]) == {"status": "not_found"}
+    assert all(v.get_job_result(j)["status"] == "completed" for j in job_ids[1:])
@@ -83,9 +83,9 @@ class ModelLoader:
             cache_key = f"emb::{model_name}"
             with _CACHE_LOCK:
                 if cache_key in _EMBEDDING_CACHE:
-                    log.info(f"Reusing cached embedding model: {model_name}")
+                    log.info("Reusing cached embedding model", model=model_name)
                     return _EMBEDDING_CACHE[cache_key]
-                log.info(f"Loading embedding model: {model_name}")
+                log.info("Loading embedding model", model=model_name)
                 emb = GoogleGenerativeAIEmbeddings(model=model_name,
                                                    google_api_key=self.api_key_mgr.get("GOOGLE_API_KEY")) #type: ignore
                 _EMBEDDING_CACHE[cache_key] = emb
@@ -116,7 +116,7 @@ class ModelLoader:
         cache_key = f"llm::{provider}:{model_name}:{temperature}:{max_tokens}"
         with _CACHE_LOCK:
             if cache_key in _LLM_CACHE:
-                log.info(f"Reusing cached LLM: {provider}/{model_name}")
+                log.info("Reusing cached LLM", provider=provider, model=model_name)
                 return _LLM_CACHE[cache_key]
 
         if provider == "google":